@@ -1,6 +1,9 @@
 import logging
 import datetime
 from typing import List, Dict, Optional
+
+import numpy as np
+
 from src.models import (
     CourseMetadata, EvaluatedSegment, CourseAssessment, CourseEvaluation,
     AssessmentTree, GateReport, RubricResult,
@@ -9,6 +12,10 @@ from src.models import (
 
 logger = logging.getLogger(__name__)
 
+# Constant portion of CourseEvaluation.evaluation_meta — per-run values are
+# spread on top of this template in aggregate().
+_EVAL_META_BASE = {"prompt_version": "2.0"}
+
 
 class ScoreAggregator:
     """Aggregates Module Gate segment-level scores into a weighted average.
@@ -34,21 +41,30 @@ class ScoreAggregator:
         logger.info(f"Aggregating Module Gate scores for {len(segments)} segments.")
 
         # --- Module Gate: Character-length weighted average over instructional segments --
-        instructional_segments = [
-            s for s in segments
-            if getattr(s, 'segment_type', 'instructional') == 'instructional'
-            and not getattr(s, 'incomplete', False)
-        ]
-        non_instructional = [
-            s for s in segments
-            if getattr(s, 'segment_type', 'instructional') != 'instructional'
-        ]
-
-        if non_instructional:
-            types_found = {getattr(s, 'segment_type', '?') for s in non_instructional}
+        # Single pass: partition instructional vs non-instructional, collect the
+        # score rows and character weights as we go instead of re-scanning the
+        # segment list once per concern.
+        instructional_segments: List[EvaluatedSegment] = []
+        non_instructional_count = 0
+        non_instructional_types = set()
+        score_rows = []
+        weight_values = []
+
+        for s in segments:
+            if getattr(s, 'segment_type', 'instructional') != 'instructional':
+                non_instructional_count += 1
+                non_instructional_types.add(getattr(s, 'segment_type', '?'))
+                continue
+            if getattr(s, 'incomplete', False):
+                continue
+            instructional_segments.append(s)
+            score_rows.append([getattr(s.scores, dim) for dim in self._MODULE_DIMENSIONS])
+            weight_values.append(len(s.text))
+
+        if non_instructional_count:
             logger.info(
-                f"Excluding {len(non_instructional)} non-instructional segment(s) from Module Gate aggregate "
-                f"(types: {', '.join(sorted(types_found))})."
+                f"Excluding {non_instructional_count} non-instructional segment(s) from Module Gate aggregate "
+                f"(types: {', '.join(sorted(non_instructional_types))})."
             )
 
         module_overall: Dict[str, float] = {dim: 0.0 for dim in self._MODULE_DIMENSIONS}
@@ -58,26 +74,20 @@ class ScoreAggregator:
         elif not instructional_segments:
             logger.warning("No complete instructional segments found — Module Gate scores will be 0.")
         else:
-            scoring_pool = instructional_segments
-            total_weight = sum(len(s.text) for s in scoring_pool)
+            # Weighted average as a single dot product instead of looping
+            # segments × dims in Python (see chunk0-3).
+            scores_matrix = np.array(score_rows, dtype=np.float64)
+            weights = np.array(weight_values, dtype=np.float64)
+            total_weight = weights.sum()
 
             if total_weight == 0:
                 logger.warning("Total text weight is zero — falling back to simple average.")
-                n = len(scoring_pool)
-                for seg in scoring_pool:
-                    scores_dict = seg.scores.model_dump() if hasattr(seg.scores, 'model_dump') else {}
-                    for dim in self._MODULE_DIMENSIONS:
-                        module_overall[dim] += scores_dict.get(dim, 0)
-                for dim in self._MODULE_DIMENSIONS:
-                    module_overall[dim] = round(module_overall[dim] / n, 2)
+                averaged = scores_matrix.mean(axis=0)
             else:
-                for seg in scoring_pool:
-                    scores_dict = seg.scores.model_dump() if hasattr(seg.scores, 'model_dump') else {}
-                    weight = len(seg.text) / total_weight
-                    for dim in self._MODULE_DIMENSIONS:
-                        module_overall[dim] += scores_dict.get(dim, 0) * weight
-                for dim in self._MODULE_DIMENSIONS:
-                    module_overall[dim] = round(module_overall[dim], 2)
+                averaged = (weights @ scores_matrix) / total_weight
+
+            for dim, value in zip(self._MODULE_DIMENSIONS, averaged):
+                module_overall[dim] = round(float(value), 2)
 
         # Module Gate overall: simple mean of all 5 dimension scores (ADR-028)
         dim_scores = [v for v in module_overall.values()]
@@ -106,16 +116,18 @@ class ScoreAggregator:
             course_assessment=course_assessment,
         )
 
+        # Pass the Pydantic models through directly: dumping to dicts here only
+        # forces CourseEvaluation to re-validate every segment from scratch.
         return CourseEvaluation(
-            course_metadata=metadata.model_dump() if hasattr(metadata, 'model_dump') else metadata,
+            course_metadata=metadata,
             assessment=assessment_tree,
             module_gate=module_overall,
             course_gate=course_assessment,
-            segments=[s.model_dump() if hasattr(s, 'model_dump') else s for s in segments],
+            segments=list(segments),
             evaluation_meta={
+                **_EVAL_META_BASE,
                 "model_used": model_used,
                 "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
-                "prompt_version": "2.0",
                 "total_segments": len(segments),
                 "instructional_segments_scored": len(instructional_segments),
                 "excluded_segments": len(segments) - len(instructional_segments),
@@ -1,17 +1,22 @@
+import functools
+import hashlib
 import json
 import logging
 import os
+import random
+import re
 import sys
 import time
+import orjson
 import yaml
 from pathlib import Path
-from pydantic import ValidationError
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 
 from typing import List, Tuple, Optional
 
-from anthropic import Anthropic
-from google import genai
-from google.genai import types
+# anthropic / google-genai are imported lazily in __init__ and the Gemini call
+# sites: both SDKs pull in heavyweight pydantic machinery that unit tests and
+# non-evaluation entry points (aggregator, metadata CLI) never need.
 
 from src.models import (
     Segment, CourseMetadata,
@@ -29,10 +34,101 @@ _CRITERION_SCHEMA = {
     "required": [f"c{i}" for i in range(1, 6)],
 }
 
+# Persistent Module Gate response cache. Keys cover segment text + heading,
+# the rubrics YAML, the model id, and this version constant, so bumping the
+# prompt schema (keep in sync with aggregator prompt_version) invalidates
+# every stale entry without manual cleanup.
+_CACHE_PROMPT_VERSION = "2.0"
+_DEFAULT_CACHE_DIR = Path.home() / ".cache" / "semantic_flow"
+
 # Per-batch retry budget for the selected model.
 MAX_RETRIES_PER_BATCH = 3
 RETRY_BACKOFF_SECONDS = 5  # doubles each attempt: 5s → 10s → 20s
 
+# Shared zero-filled instances for bypassed / incomplete segments. Both models
+# are frozen (see models.py), so every such segment can reference the same
+# object instead of re-validating five zeros per segment.
+_ZERO_MODULE_SCORES = ModuleScores(
+    goal_focus=0, text_readability=0, pedagogical_clarity=0,
+    example_concreteness=0, example_coherence=0,
+)
+_EMPTY_MODULE_REASONING = ModuleReasoning()
+
+# Prefer PyYAML's libyaml-backed loader (10-50x faster than the pure-Python
+# one); CSafeLoader is absent when PyYAML was built without libyaml.
+try:
+    _YAML_LOADER = yaml.CSafeLoader
+except AttributeError:
+    _YAML_LOADER = yaml.SafeLoader
+
+
+class _ModuleEvalItem(BaseModel):
+    """One entry of the Module Gate tool-call 'evaluations' array."""
+    segment_id: int
+    summary: str = ""
+    scores: ModuleScores
+    criteria_scores: dict = Field(default_factory=dict)
+    reasoning: ModuleReasoning = Field(default_factory=ModuleReasoning)
+
+
+# Validates the whole LLM result array in one pydantic-core pass instead of
+# two model_validate calls plus exception handling per segment.
+_MODULE_EVAL_ADAPTER = TypeAdapter(List[_ModuleEvalItem])
+
+# PDF extraction leaves token-wasting noise in segment text: runs of spaces
+# from column layouts, stacked blank lines, and repeated [?] glyph
+# placeholders. Compacting them before the text is embedded in a prompt cuts
+# input tokens without touching wording or the [FIGURE]/[TABLE]/[CODE] markers
+# the rubrics rely on.
+_RE_HSPACE_RUNS = re.compile(r"[ \t]{2,}")
+_RE_BLANK_RUNS = re.compile(r"\n{3,}")
+_RE_PLACEHOLDER_RUNS = re.compile(r"(?:\[\?\]\s*){2,}")
+
+
+def _compact_segment_text(text: str) -> str:
+    """Collapse extraction whitespace/placeholder noise for prompt embedding."""
+    text = _RE_HSPACE_RUNS.sub(" ", text)
+    text = _RE_BLANK_RUNS.sub("\n\n", text)
+    return _RE_PLACEHOLDER_RUNS.sub("[?] ", text)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_rubrics_cached(resolved_path: str) -> Tuple[tuple, tuple, str, str]:
+    """Parse and render the rubrics YAML once per resolved path.
+
+    YAML parsing is pure-Python and slow; caching at module level makes every
+    LLMEvaluator construction after the first (batch runs, tests) free.
+    """
+    with open(resolved_path, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=_YAML_LOADER)
+    module_data = tuple(data.get("module_rubrics", []))
+    course_data = tuple(data.get("course_rubrics", []))
+    module_prompt = LLMEvaluator._format_rubrics_for_prompt(list(module_data))
+    course_prompt = LLMEvaluator._format_rubrics_for_prompt(list(course_data))
+    return module_data, course_data, module_prompt, course_prompt
+
+
+
+# Static tail of the Module Gate system prompt — metadata-independent, so it is
+# rendered once at import time rather than per batch.
+_MODULE_PROMPT_SUFFIX = """
+
+EXTRACTION NOTES (pipeline artifacts — do not penalise the course for these):
+- Figures referenced in the text (e.g. "Fig. 1.1") are not available as images. Evaluate figure references positively as indicators of visual support.
+- [FIGURE X.Y: caption] markers show a figure caption extracted from the PDF — treat as evidence of visual content.
+- Text was extracted from PDF; minor formatting artifacts (e.g. [?] placeholders) are NOT a property of the course.
+- [TABLE: ...] markers indicate a table was detected but could not be rendered as prose — treat as a structured reference element.
+- [CODE] / [/CODE] blocks contain verbatim code examples extracted from a monospace font region.
+- HEADING MISMATCH: If a segment's extracted heading appears inconsistent with its body text (e.g. the heading names a chapter whose content does not begin until the following segment), treat this as a PDF extraction boundary artifact. Evaluate the body on its own merits. Do NOT penalise goal_focus C4 solely because the extracted heading and the body text are misaligned — only penalise when the body itself is unfocused or digressive regardless of the heading.
+
+For each segment, you must also provide a 'summary' of 3-4 sentences covering:
+(1) the topic and key concepts taught in this segment,
+(2) the prerequisite knowledge this segment assumes from the reader,
+(3) what the learner can do or understand after reading it,
+(4) how this segment connects to or leads into the next topic.
+This summary will be used as the primary input to a subsequent holistic course-level evaluation — richer summaries produce more accurate course assessments.
+"""
+
 
 class LLMEvaluator:
     """Two-Gate pedagogical evaluator using Claude or Gemini.
@@ -52,38 +148,100 @@ class LLMEvaluator:
         usability, business relevance, fluidity, instructional alignment).
     """
 
-    def __init__(self, config_path: Path, preferred_model: str = "claude"):
+    def __init__(self, config_path: Path, preferred_model: str = "claude",
+                 use_cache: bool = True):
         self.config_path = Path(config_path)
         self.preferred_model = preferred_model.lower()
+        self._cache_dir = _DEFAULT_CACHE_DIR if use_cache else None
         self.module_rubrics_yaml, self.course_rubrics_yaml = self._load_rubrics()
+        # Rendered Module Gate prompt headers, keyed by course metadata (chunk0-7).
+        self._module_header_cache: dict = {}
 
         self.anthropic_key = os.getenv("ANTHROPIC_API_KEY")
         self.gemini_key = os.getenv("GEMINI_API_KEY")
 
+        self._http_client = None
+
         if self.preferred_model == "claude":
             if not self.anthropic_key:
                 logger.critical("ANTHROPIC_API_KEY missing but Claude was requested.")
                 raise ValueError("ANTHROPIC_API_KEY is required for Claude model")
-            self.anthropic_client = Anthropic(api_key=self.anthropic_key)
+            from anthropic import Anthropic, DefaultHttpxClient
+
+            # One keep-alive pool shared by every Module/Course Gate call, so
+            # concurrent batches reuse warm TLS connections instead of paying a
+            # handshake per request. DefaultHttpxClient carries the SDK's
+            # connection limits (20 keep-alive / 100 max) and lets us own the
+            # pool's lifecycle via close().
+            self._http_client = DefaultHttpxClient()
+            self.anthropic_client = Anthropic(
+                api_key=self.anthropic_key, http_client=self._http_client
+            )
+            self.claude_model = 'sonnet-4-6'
             self.gemini_client = None
         elif self.preferred_model == "gemini":
             if not self.gemini_key:
                 logger.critical("GEMINI_API_KEY missing but Gemini was requested.")
                 raise ValueError("GEMINI_API_KEY is required for Gemini model")
+            from google import genai
+
             self.gemini_client = genai.Client(api_key=self.gemini_key)
             self.gemini_model = 'gemini-2.5-flash'
             self.anthropic_client = None
         else:
             raise ValueError(f"Unsupported model requested: {self.preferred_model}")
 
+    def close(self) -> None:
+        """Release the shared HTTP connection pool (no-op for Gemini, which
+        manages its own transport)."""
+        if self._http_client is not None:
+            self._http_client.close()
+            self._http_client = None
+
+    # -------------------------------------------------------------------------
+    # Module Gate response cache (content-addressed, persistent across runs)
+    # -------------------------------------------------------------------------
+
+    def _module_cache_key(self, segment: Segment) -> str:
+        """Content hash covering everything that can change a segment's scores."""
+        model_id = self.claude_model if self.anthropic_client else self.gemini_model
+        payload = "\x1f".join((
+            _CACHE_PROMPT_VERSION, model_id, self.module_rubrics_yaml,
+            segment.heading or "", segment.text,
+        ))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _cache_load(self, key: str) -> Optional[EvaluatedSegment]:
+        if self._cache_dir is None:
+            return None
+        path = self._cache_dir / f"{key}.json"
+        try:
+            with open(path, "rb") as f:
+                return EvaluatedSegment.model_validate(orjson.loads(f.read()))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # A corrupt entry is a miss, not a failure — the API call re-creates it.
+            logger.warning(f"Ignoring unreadable cache entry {path.name}: {e}")
+            return None
+
+    def _cache_store(self, key: str, evaluated: EvaluatedSegment) -> None:
+        if self._cache_dir is None or getattr(evaluated, 'incomplete', False):
+            return
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(self._cache_dir / f"{key}.json", "wb") as f:
+                f.write(orjson.dumps(evaluated.model_dump(mode='json')))
+        except OSError as e:
+            logger.warning(f"Could not write evaluation cache entry: {e}")
+
     def _load_rubrics(self) -> Tuple[str, str]:
         """Load rubrics from YAML and store parsed objects + formatted prompt strings."""
-        with open(self.config_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-        self._module_rubrics_data = data.get("module_rubrics", [])
-        self._course_rubrics_data = data.get("course_rubrics", [])
-        module_prompt = self._format_rubrics_for_prompt(self._module_rubrics_data)
-        course_prompt = self._format_rubrics_for_prompt(self._course_rubrics_data)
+        module_data, course_data, module_prompt, course_prompt = _load_rubrics_cached(
+            str(self.config_path.resolve())
+        )
+        self._module_rubrics_data = list(module_data)
+        self._course_rubrics_data = list(course_data)
         return module_prompt, course_prompt
 
     @staticmethod
@@ -141,7 +299,28 @@ class LLMEvaluator:
     # SHARED UTILITIES
     # -------------------------------------------------------------------------
 
+    @staticmethod
+    def _retry_after_hint(exc: Exception) -> Optional[float]:
+        """Server-suggested wait from a Retry-After header, if the exception
+        carries an HTTP response (Anthropic/Gemini SDK errors do on 429/503)."""
+        headers = getattr(getattr(exc, 'response', None), 'headers', None)
+        if not headers:
+            return None
+        value = headers.get('retry-after')
+        try:
+            return float(value) if value is not None else None
+        except (TypeError, ValueError):
+            return None
+
     def _retry_call(self, call_fn, model_name: str, batch_size: int):
+        """Run `call_fn` with exponential backoff on retryable errors.
+
+        The backoff sleep blocks only the calling thread: under `--concurrency`
+        each Module Gate batch runs on its own worker, so a batch waiting out a
+        429/503 does not stall the others. Waits honour the server's
+        Retry-After hint when present and are jittered so concurrent batches
+        sharing one rate-limit bucket do not all wake and re-collide together.
+        """
         last_exc = None
         for attempt in range(1, MAX_RETRIES_PER_BATCH + 1):
             try:
@@ -155,6 +334,12 @@ class LLMEvaluator:
             except Exception as e:
                 last_exc = e
                 wait = RETRY_BACKOFF_SECONDS * (2 ** (attempt - 1))  # 5, 10, 20
+                # Jitter only the backoff term; a Retry-After hint is a floor
+                # the server mandates, so it must never be undercut.
+                wait *= random.uniform(0.7, 1.3)
+                server_hint = self._retry_after_hint(e)
+                if server_hint is not None:
+                    wait = max(wait, server_hint)
                 if attempt < MAX_RETRIES_PER_BATCH:
                     err_str = str(e).lower()
                     retryable = (
@@ -167,7 +352,7 @@ class LLMEvaluator:
 
                     logger.warning(
                         f"{model_name} attempt {attempt}/{MAX_RETRIES_PER_BATCH} failed handling batch. "
-                        f"Retrying in {wait}s... Error: {e}"
+                        f"Retrying in {wait:.1f}s... Error: {e}"
                     )
                     time.sleep(wait)
                 else:
@@ -177,14 +362,14 @@ class LLMEvaluator:
         raise last_exc
 
     def _parse_json_result(self, text: str) -> list:
-        text = text.strip()
-        if text.startswith("```json"):
-            text = text[7:]
-        if text.startswith("```"):
-            text = text[3:]
-        if text.endswith("```"):
-            text = text[:-3]
-        return json.loads(text.strip())
+        text = (
+            text.strip()
+            .removeprefix("```json")
+            .removeprefix("```")
+            .removesuffix("```")
+            .strip()
+        )
+        return orjson.loads(text)
 
     def _unwrap_gemini_list(self, raw) -> list:
         """Normalize Gemini response to a flat list of evaluation dicts.
@@ -264,6 +449,11 @@ class LLMEvaluator:
     _MODULE_EVAL_TOOL = {
         "name": "submit_module_evaluations",
         "description": "Submit the Module Gate evaluations for all provided instructional segments.",
+        # Tool schemas sit before the system prompt in Anthropic's cache prefix;
+        # marking the (only) tool ephemeral lets every batch after the first hit
+        # the server-side cache for the schema tokens. Gemini ignores this key —
+        # its path only reads input_schema.
+        "cache_control": {"type": "ephemeral"},
         "input_schema": {
             "type": "object",
             "properties": {
@@ -312,7 +502,7 @@ class LLMEvaluator:
         metadata: CourseMetadata,
         segments: List[Segment],
         previous_summaries: Optional[List[str]] = None,
-    ) -> Tuple[str, str]:
+    ) -> Tuple[str, str, str]:
         # ADR-030: Build cross-segment context
         cross_segment_ctx = ""
         if previous_summaries:
@@ -325,7 +515,38 @@ class LLMEvaluator:
 Use this context to detect repetition, non-progressive examples, and redundant content
 across segments. If a segment repeats topics already covered, note this in your rationale."""
 
-        system_prompt = f"""
+        # The header (metadata + rubrics + anchors) is identical for every batch of
+        # one course — render it once per metadata and reuse; only the ADR-030
+        # narrative context varies batch to batch. Header and tail are returned
+        # separately so the Claude path can mark the stable prefix for
+        # provider-side prompt caching.
+        system_header = self._module_prompt_header(metadata).strip()
+        system_tail = cross_segment_ctx + _MODULE_PROMPT_SUFFIX
+
+        # Accumulate into a list and join once — += on a str re-copies the whole
+        # prompt (which embeds full segment texts) on every append.
+        user_parts = ["Score the following segments:\n\n"]
+        for i, s in enumerate(segments):
+            user_parts.append(f"--- SEGMENT ID: {s.segment_id} ---\n")
+            # ADR-030: inject previous segment summary for cross-segment awareness
+            if i > 0 and segments[i-1].segment_id in [seg.segment_id for seg in segments[:i]]:
+                user_parts.append(f"(Previous segment covered: see segment {segments[i-1].segment_id} above)\n")
+            user_parts.append(f"Text:\n{_compact_segment_text(s.text)}\n\n")
+
+        return system_header, system_tail.rstrip(), "".join(user_parts).strip()
+
+    def _module_prompt_header(self, metadata: CourseMetadata) -> str:
+        key = (
+            metadata.title,
+            metadata.target_audience,
+            tuple(metadata.learning_outcomes_stated or ()),
+            tuple(metadata.learning_outcomes_inferred or ()),
+        )
+        cached = self._module_header_cache.get(key)
+        if cached is not None:
+            return cached
+
+        header = f"""
 You are an expert pedagogical evaluator. Evaluate the provided course segments based strictly on the following MODULE rubrics.
 
 COURSE CONTEXT (for reference only — do not score course-level structure here):
@@ -383,109 +604,100 @@ CALIBRATION ANCHORS — scores MUST match these exemplars. If in doubt, score lo
     2 — No real-world context; every example uses a=5, x=[1,2,3], or a domain-labelled placeholder with no task
     5 — Domain label present (e.g. "employee_salary") but no professional workflow, decision, or real task is shown
     8 — Realistic scenario with a professional task: "parse shift records from CSV, flag overtime, generate payslip"
-{cross_segment_ctx}
-
-EXTRACTION NOTES (pipeline artifacts — do not penalise the course for these):
-- Figures referenced in the text (e.g. "Fig. 1.1") are not available as images. Evaluate figure references positively as indicators of visual support.
-- [FIGURE X.Y: caption] markers show a figure caption extracted from the PDF — treat as evidence of visual content.
-- Text was extracted from PDF; minor formatting artifacts (e.g. [?] placeholders) are NOT a property of the course.
-- [TABLE: ...] markers indicate a table was detected but could not be rendered as prose — treat as a structured reference element.
-- [CODE] / [/CODE] blocks contain verbatim code examples extracted from a monospace font region.
-- HEADING MISMATCH: If a segment's extracted heading appears inconsistent with its body text (e.g. the heading names a chapter whose content does not begin until the following segment), treat this as a PDF extraction boundary artifact. Evaluate the body on its own merits. Do NOT penalise goal_focus C4 solely because the extracted heading and the body text are misaligned — only penalise when the body itself is unfocused or digressive regardless of the heading.
-
-For each segment, you must also provide a 'summary' of 3-4 sentences covering:
-(1) the topic and key concepts taught in this segment,
-(2) the prerequisite knowledge this segment assumes from the reader,
-(3) what the learner can do or understand after reading it,
-(4) how this segment connects to or leads into the next topic.
-This summary will be used as the primary input to a subsequent holistic course-level evaluation — richer summaries produce more accurate course assessments.
 """
-        user_prompt = "Score the following segments:\n\n"
-        for i, s in enumerate(segments):
-            user_prompt += f"--- SEGMENT ID: {s.segment_id} ---\n"
-            # ADR-030: inject previous segment summary for cross-segment awareness
-            if i > 0 and segments[i-1].segment_id in [seg.segment_id for seg in segments[:i]]:
-                user_prompt += f"(Previous segment covered: see segment {segments[i-1].segment_id} above)\n"
-            user_prompt += f"Text:\n{s.text}\n\n"
+        self._module_header_cache[key] = header
+        return header
 
-        return system_prompt.strip(), user_prompt.strip()
 
     # -------------------------------------------------------------------------
     # MODULE GATE — Execution
     # -------------------------------------------------------------------------
 
     def _make_incomplete_segment(self, segment: Segment) -> EvaluatedSegment:
-        return EvaluatedSegment(
+        # model_construct: every value here is known-good (copied from an
+        # already-validated Segment or a shared zero constant), so full
+        # validation is skipped on this hot fallback path.
+        return EvaluatedSegment.model_construct(
             segment_id=segment.segment_id,
             heading=segment.heading,
             text=segment.text,
             segment_type=segment.segment_type,
-            scores=ModuleScores(
-                goal_focus=0, text_readability=0, pedagogical_clarity=0,
-                example_concreteness=0, example_coherence=0,
-            ),
-            reasoning=ModuleReasoning(),
+            scores=_ZERO_MODULE_SCORES,
+            reasoning=_EMPTY_MODULE_REASONING,
+            criteria_scores={},
             summary="",
             incomplete=True,
         )
 
     def _match_module_evaluations(self, data: list, segments: List[Segment]) -> List[EvaluatedSegment]:
-        evals = []
-        data_by_id = {item["segment_id"]: item for item in data if "segment_id" in item}
+        # Validate the whole array in one pydantic-core pass. The common case
+        # (every item well-formed) costs a single validator call; only when the
+        # batch as a whole fails do we fall back to per-item validation so one
+        # malformed entry cannot sink its siblings.
+        try:
+            validated = _MODULE_EVAL_ADAPTER.validate_python(data)
+        except ValidationError:
+            validated = []
+            for item in data:
+                try:
+                    validated.append(_ModuleEvalItem.model_validate(item))
+                except ValidationError as e:
+                    logger.warning(
+                        f"Partial/invalid module evaluation for segment "
+                        f"{item.get('segment_id', '?') if isinstance(item, dict) else '?'}: {e}. "
+                        f"Marking as incomplete."
+                    )
 
+        by_id = {v.segment_id: v for v in validated}
+
+        evals = []
         for segment in segments:
-            if segment.segment_id not in data_by_id:
+            item = by_id.get(segment.segment_id)
+            if item is None:
                 logger.warning(f"Missing evaluation for segment_id {segment.segment_id}; marking as incomplete.")
                 evals.append(self._make_incomplete_segment(segment))
                 continue
 
-            item = data_by_id[segment.segment_id]
-            try:
-                scores = ModuleScores(**item.get("scores", {}))
-                reasoning = ModuleReasoning(**item.get("reasoning", {}))
-                criteria_scores = item.get("criteria_scores", {})
-                summary = item.get("summary", "")
-                incomplete = False
-            except (ValidationError, Exception) as e:
-                logger.warning(f"Partial/invalid module evaluation for segment {segment.segment_id}: {e}. Marking as incomplete.")
-                scores = ModuleScores(
-                    goal_focus=0, text_readability=0, pedagogical_clarity=0,
-                    example_concreteness=0, example_coherence=0,
-                )
-                reasoning = ModuleReasoning()
-                criteria_scores = {}
-                summary = ""
-                incomplete = True
-
-            evals.append(EvaluatedSegment(
+            # Components are already validated above — model_construct skips
+            # re-validating them field by field.
+            evals.append(EvaluatedSegment.model_construct(
                 segment_id=segment.segment_id,
                 heading=segment.heading,
                 text=segment.text,
                 segment_type=segment.segment_type,
-                scores=scores,
-                criteria_scores=criteria_scores,
-                reasoning=reasoning,
-                summary=summary,
-                incomplete=incomplete,
+                scores=item.scores,
+                criteria_scores=item.criteria_scores,
+                reasoning=item.reasoning,
+                summary=item.summary,
+                incomplete=False,
             ))
         return evals
 
-    def _call_claude_module_batch(self, system_prompt: str, user_prompt: str, segments: List[Segment]) -> List[EvaluatedSegment]:
+    def _call_claude_module_batch(self, system_header: str, system_tail: str, user_prompt: str, segments: List[Segment]) -> List[EvaluatedSegment]:
         logger.info(f"[Module Gate] Evaluating batch of {len(segments)} segments via Claude")
+        # The static header (metadata + rubrics + anchors) is marked for
+        # provider-side prompt caching: every batch after the first within a
+        # course reads it from cache instead of re-processing ~10K chars.
         response = self.anthropic_client.messages.create(
-            model="sonnet-4-6",
+            model=self.claude_model,
             max_tokens=8192,
             temperature=0.2,
-            system=system_prompt,
+            system=[
+                {"type": "text", "text": system_header, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": system_tail},
+            ],
             messages=[{"role": "user", "content": user_prompt}],
             tools=[self._MODULE_EVAL_TOOL],
-            tool_choice={"type": "tool", "name": "submit_module_evaluations"},
+            tool_choice={"type": "tool", "name": "submit_module_evaluations",
+                         "disable_parallel_tool_use": True},
         )
         tool_block = next(b for b in response.content if b.type == "tool_use")
         data = tool_block.input["evaluations"]
         return self._match_module_evaluations(data, segments)
 
     def _call_gemini_module_batch(self, system_prompt: str, user_prompt: str, segments: List[Segment]) -> List[EvaluatedSegment]:
+        from google.genai import types
+
         logger.info(f"[Module Gate] Evaluating batch of {len(segments)} segments via Gemini")
         prompt = system_prompt + "\n\n" + user_prompt
         response = self.gemini_client.models.generate_content(
@@ -515,59 +727,113 @@ This summary will be used as the primary input to a subsequent holistic course-l
             previous_summaries: Summaries from previously evaluated batches
                 for cross-segment context injection (ADR-030).
         """
-        results = []
+        # Inputs arrive in segment order, so results are placed by index instead
+        # of being sorted by segment_id at the end (O(n) vs O(n log n) with a
+        # Python-callable key).
+        position = {s.segment_id: i for i, s in enumerate(segments)}
+        results: List[Optional[EvaluatedSegment]] = [None] * len(segments)
         instructional_segments = []
 
         for segment in segments:
             if segment.segment_type != "instructional":
                 logger.info(f"Bypassing Module Gate for non-instructional segment: {segment.segment_id} ({segment.segment_type})")
-                results.append(EvaluatedSegment(
+                results[position[segment.segment_id]] = EvaluatedSegment.model_construct(
                     segment_id=segment.segment_id,
                     heading=segment.heading,
                     text=segment.text,
                     segment_type=segment.segment_type,
-                    scores=ModuleScores(
-                        goal_focus=0, text_readability=0, pedagogical_clarity=0,
-                        example_concreteness=0, example_coherence=0,
-                    ),
-                    reasoning=ModuleReasoning(),
+                    scores=_ZERO_MODULE_SCORES,
+                    reasoning=_EMPTY_MODULE_REASONING,
+                    criteria_scores={},
                     summary="",
-                ))
+                    incomplete=False,
+                )
             else:
                 instructional_segments.append(segment)
 
         if not instructional_segments:
-            return sorted(results, key=lambda x: x.segment_id)
+            return results
+
+        # Replay cached evaluations and send only the cache misses to the API.
+        # Keys are content hashes, so a re-run on the same course (or the same
+        # chapter appearing in two input files) costs nothing.
+        cache_keys = {}
+        uncached_segments = []
+        for segment in instructional_segments:
+            key = self._module_cache_key(segment)
+            cache_keys[segment.segment_id] = key
+            hit = self._cache_load(key)
+            if hit is not None:
+                logger.info(f"[Module Gate] Cache hit for segment {segment.segment_id}")
+                results[position[segment.segment_id]] = hit.model_copy(
+                    update={'segment_id': segment.segment_id}
+                )
+            else:
+                uncached_segments.append(segment)
+
+        if not uncached_segments:
+            return results
+
+        # Identical texts (repeated boilerplate: objectives blocks, chapter
+        # intros, copyright pages) score identically — evaluate one
+        # representative per unique text and fan its result out to the
+        # duplicates afterwards.
+        text_groups: dict = {}
+        representatives = []
+        for segment in uncached_segments:
+            digest = hashlib.sha256(segment.text.encode('utf-8')).digest()
+            group = text_groups.get(digest)
+            if group is None:
+                text_groups[digest] = [segment]
+                representatives.append(segment)
+            else:
+                group.append(segment)
+        duplicate_count = len(uncached_segments) - len(representatives)
+        if duplicate_count:
+            logger.info(
+                f"[Module Gate] {duplicate_count} segment(s) share text with another in this "
+                f"batch — dispatching {len(representatives)} unique segment(s)."
+            )
+        group_by_rep_id = {group[0].segment_id: group for group in text_groups.values()}
+
+        # Check for a usable client before rendering the (multi-KB) prompts —
+        # there is nothing to build them for otherwise.
+        if not self.anthropic_client and not self.gemini_client:
+            logger.critical("Fatal: Both clients are missing API keys.")
+            raise ValueError("No API client configured.")
 
-        system_prompt, user_prompt = self._build_module_batch_prompts(
-            metadata, instructional_segments, previous_summaries
+        system_header, system_tail, user_prompt = self._build_module_batch_prompts(
+            metadata, representatives, previous_summaries
         )
 
         try:
             if self.anthropic_client:
                 evals = self._retry_call(
-                    lambda: self._call_claude_module_batch(system_prompt, user_prompt, instructional_segments),
+                    lambda: self._call_claude_module_batch(system_header, system_tail, user_prompt, representatives),
                     "Claude",
-                    len(instructional_segments)
+                    len(representatives)
                 )
             elif self.gemini_client:
                 evals = self._retry_call(
-                    lambda: self._call_gemini_module_batch(system_prompt, user_prompt, instructional_segments),
+                    lambda: self._call_gemini_module_batch(system_header + system_tail, user_prompt, representatives),
                     "Gemini",
-                    len(instructional_segments)
+                    len(representatives)
                 )
-            else:
-                logger.critical("Fatal: Both clients are missing API keys.")
-                raise ValueError("No API client configured.")
         except Exception as e:
             logger.error(
-                f"Batch of {len(instructional_segments)} segments failed after all retries; "
+                f"Batch of {len(representatives)} segments failed after all retries; "
                 f"marking as incomplete. Error: {e}"
             )
-            evals = [self._make_incomplete_segment(s) for s in instructional_segments]
+            evals = [self._make_incomplete_segment(s) for s in representatives]
 
-        results.extend(evals)
-        return sorted(results, key=lambda x: x.segment_id)
+        for ev in evals:
+            for segment in group_by_rep_id[ev.segment_id]:
+                placed = ev if segment.segment_id == ev.segment_id else ev.model_copy(
+                    update={'segment_id': segment.segment_id, 'heading': segment.heading}
+                )
+                self._cache_store(cache_keys[segment.segment_id], placed)
+                results[position[segment.segment_id]] = placed
+        return results
 
     # -------------------------------------------------------------------------
     # COURSE GATE — Field Definitions (derived from models to avoid duplication)
@@ -579,6 +845,7 @@ This summary will be used as the primary input to a subsequent holistic course-l
     _COURSE_EVAL_TOOL = {
         "name": "submit_course_evaluation",
         "description": "Submit the holistic Course Gate evaluation for the entire course.",
+        "cache_control": {"type": "ephemeral"},
         "input_schema": {
             "type": "object",
             "properties": {
@@ -653,21 +920,23 @@ CALIBRATION GUARDS — apply before committing any score:
 - fluidity_continuity: Apparent module ordering anomalies (a module whose summary discusses a topic different from its heading) are typically PDF segmentation artifacts, not course design flaws. Do not penalise fluidity_continuity for heading/content mismatches — penalise only when the instructional content itself jumps without logical connection.
 """
 
-        user_prompt = ""
+        # List-append + single join: += would re-copy the growing prompt on
+        # every line (it embeds TOC/preface text and all module summaries).
+        user_parts = []
 
         # Include non-instructional sections (TOC, Preface) as course structure evidence.
         # critic.v4 Issue 4: frontmatter/preface segments (where the full TOC and
         # course overview live) are given a higher truncation limit so structural_usability
         # scoring is not based on a half-rendered table of contents.
         if non_instructional_segments:
-            user_prompt += "## Course Structure Sections (TOC, Preface, etc.)\n"
+            user_parts.append("## Course Structure Sections (TOC, Preface, etc.)\n")
             for seg in non_instructional_segments:
-                user_prompt += f"\n### {seg.heading or seg.segment_type.upper()} (ID {seg.segment_id})\n"
+                user_parts.append(f"\n### {seg.heading or seg.segment_type.upper()} (ID {seg.segment_id})\n")
                 text = seg.text
                 limit = 4000 if getattr(seg, "segment_type", "") in ("frontmatter", "preface") else 1500
                 if len(text) > limit:
                     text = text[:limit] + "\n[... truncated for brevity ...]"
-                user_prompt += text + "\n"
+                user_parts.append(text + "\n")
 
         # Include condensed module summaries as the sequential course narrative
         instructional_with_summary = [
@@ -675,32 +944,38 @@ CALIBRATION GUARDS — apply before committing any score:
             if s.segment_type == "instructional" and s.summary
         ]
         if instructional_with_summary:
-            user_prompt += "\n## Sequential Module Summaries (in order, with Module Gate quality scores)\n"
-            user_prompt += "The following summaries represent each module/chapter of the course in order.\n"
-            user_prompt += "Module Gate scores are provided for context — use them to calibrate your assessment.\n\n"
+            # Dump each segment's scores once up front — both the summary list and
+            # the quality-summary section below read from this map.
+            scores_by_id = {
+                seg.segment_id: seg.scores.model_dump() if hasattr(seg.scores, 'model_dump') else {}
+                for seg in instructional_with_summary
+            }
+            user_parts.append("\n## Sequential Module Summaries (in order, with Module Gate quality scores)\n")
+            user_parts.append("The following summaries represent each module/chapter of the course in order.\n")
+            user_parts.append("Module Gate scores are provided for context — use them to calibrate your assessment.\n\n")
             for seg in sorted(instructional_with_summary, key=lambda x: x.segment_id):
                 heading_label = f"**{seg.heading}**" if seg.heading else f"Module {seg.segment_id}"
                 # ADR-030 (critic.v3 Issue 9): append Module Gate scores to each summary
-                scores_dict = seg.scores.model_dump() if hasattr(seg.scores, 'model_dump') else {}
+                scores_dict = scores_by_id[seg.segment_id]
                 score_str = ", ".join(f"{k}={v}" for k, v in scores_dict.items()) if scores_dict else ""
-                user_prompt += f"- {heading_label}: {seg.summary}"
+                user_parts.append(f"- {heading_label}: {seg.summary}")
                 if score_str:
-                    user_prompt += f" [Module Gate: {score_str}]"
-                user_prompt += "\n"
+                    user_parts.append(f" [Module Gate: {score_str}]")
+                user_parts.append("\n")
 
             # ADR-030: MODULE GATE QUALITY SUMMARY section
             all_scores = []
             for seg in instructional_with_summary:
-                scores_dict = seg.scores.model_dump() if hasattr(seg.scores, 'model_dump') else {}
+                scores_dict = scores_by_id[seg.segment_id]
                 seg_avg = sum(scores_dict.values()) / max(len(scores_dict), 1) if scores_dict else 0
                 all_scores.append((seg.segment_id, seg.heading, seg_avg, scores_dict))
 
             if all_scores:
                 overall_avg = sum(s[2] for s in all_scores) / len(all_scores)
                 lowest = min(all_scores, key=lambda s: s[2])
-                user_prompt += f"\n## MODULE GATE QUALITY SUMMARY\n"
-                user_prompt += f"- Average Module Gate score across {len(all_scores)} segments: {overall_avg:.1f}/10\n"
-                user_prompt += f"- Lowest-scoring segment: ID {lowest[0]} ({lowest[1] or 'untitled'}) — avg {lowest[2]:.1f}\n"
+                user_parts.append(f"\n## MODULE GATE QUALITY SUMMARY\n")
+                user_parts.append(f"- Average Module Gate score across {len(all_scores)} segments: {overall_avg:.1f}/10\n")
+                user_parts.append(f"- Lowest-scoring segment: ID {lowest[0]} ({lowest[1] or 'untitled'}) — avg {lowest[2]:.1f}\n")
 
                 # Pass weakest segment's actual text and per-dimension rationales so the
                 # Course Gate can reason about evidence quality, not just numeric scores.
@@ -708,7 +983,7 @@ CALIBRATION GUARDS — apply before committing any score:
                     (s for s in instructional_with_summary if s.segment_id == lowest[0]), None
                 )
                 if lowest_seg:
-                    user_prompt += (
+                    user_parts.append(
                         f"- Weakest segment text sample:\n"
                         f"  {lowest_seg.text[:600].strip()}\n"
                     )
@@ -723,14 +998,14 @@ CALIBRATION GUARDS — apply before committing any score:
                             if r:
                                 rationale_lines.append(f"  {dim}: {r[:200]}")
                         if rationale_lines:
-                            user_prompt += "- Weakest segment per-dimension rationales:\n"
-                            user_prompt += "\n".join(rationale_lines) + "\n"
+                            user_parts.append("- Weakest segment per-dimension rationales:\n")
+                            user_parts.append("\n".join(rationale_lines) + "\n")
 
                 # Top 3 strongest segments as contrast
                 top3 = sorted(all_scores, key=lambda s: s[2], reverse=True)[:3]
-                user_prompt += "- Top 3 strongest segments:\n"
+                user_parts.append("- Top 3 strongest segments:\n")
                 for seg_id, heading, avg, _ in top3:
-                    user_prompt += f"  ID {seg_id} ({heading or 'untitled'}): avg {avg:.1f}\n"
+                    user_parts.append(f"  ID {seg_id} ({heading or 'untitled'}): avg {avg:.1f}\n")
 
                 # Detect repetition: segments with very similar summaries
                 summaries_text = [s.summary.lower() for s in instructional_with_summary if s.summary]
@@ -747,10 +1022,10 @@ CALIBRATION GUARDS — apply before committing any score:
                                 seg_b = instructional_with_summary[j_s].segment_id
                                 repeated_topics.append(f"Segments {seg_a} and {seg_b}")
                 if repeated_topics:
-                    user_prompt += f"- ⚠️ Potential content repetition detected: {'; '.join(repeated_topics[:5])}\n"
+                    user_parts.append(f"- ⚠️ Potential content repetition detected: {'; '.join(repeated_topics[:5])}\n")
 
-        user_prompt += f"\n\nNow evaluate the course holistically on the Course Gate rubrics listed above."
-        return system_prompt.strip(), user_prompt.strip()
+        user_parts.append(f"\n\nNow evaluate the course holistically on the Course Gate rubrics listed above.")
+        return system_prompt.strip(), "".join(user_parts).strip()
 
     # -------------------------------------------------------------------------
     # COURSE GATE — Execution
@@ -817,24 +1092,27 @@ CALIBRATION GUARDS — apply before committing any score:
     def _call_claude_course(self, system_prompt: str, user_prompt: str) -> CourseAssessment:
         logger.info("[Course Gate] Running capstone course evaluation via Claude")
         response = self.anthropic_client.messages.create(
-            model="sonnet-4-6",
+            model=self.claude_model,
             max_tokens=4096,
             temperature=0.2,
             system=system_prompt,
             messages=[{"role": "user", "content": user_prompt}],
             tools=[self._COURSE_EVAL_TOOL],
-            tool_choice={"type": "tool", "name": "submit_course_evaluation"},
+            tool_choice={"type": "tool", "name": "submit_course_evaluation",
+                         "disable_parallel_tool_use": True},
         )
         tool_block = next(b for b in response.content if b.type == "tool_use")
         data = tool_block.input
-        scores = CourseScores(**data["scores"])
-        reasoning = CourseReasoning(**data["reasoning"])
+        scores = CourseScores.model_validate(data["scores"])
+        reasoning = CourseReasoning.model_validate(data["reasoning"])
         criteria_scores = data.get("criteria_scores", {})
         score_values = [v for v in data["scores"].values() if isinstance(v, (int, float))]
         overall = round(sum(score_values) / len(score_values), 2) if score_values else 0.0
         return CourseAssessment(scores=scores, reasoning=reasoning, criteria_scores=criteria_scores, overall_score=overall)
 
     def _call_gemini_course(self, system_prompt: str, user_prompt: str) -> CourseAssessment:
+        from google.genai import types
+
         logger.info("[Course Gate] Running capstone course evaluation via Gemini")
         prompt = system_prompt + "\n\n" + user_prompt
         response = self.gemini_client.models.generate_content(
@@ -852,8 +1130,8 @@ CALIBRATION GUARDS — apply before committing any score:
         except Exception as e:
             logger.error(f"[Course Gate] Gemini JSON parse/unwrap failed: {e}. Raw response: {response.text[:500]}")
             raise
-        scores = CourseScores(**data["scores"])
-        reasoning = CourseReasoning(**data.get("reasoning", {}))
+        scores = CourseScores.model_validate(data["scores"])
+        reasoning = CourseReasoning.model_validate(data.get("reasoning", {}))
         criteria_scores = data.get("criteria_scores", {})
         score_values = [v for v in data["scores"].values() if isinstance(v, (int, float))]
         overall = round(sum(score_values) / len(score_values), 2) if score_values else 0.0
@@ -877,6 +1155,8 @@ CALIBRATION GUARDS — apply before committing any score:
             is_partial_course is True when the file appears to be a fragment of a larger course.
         """
         non_instructional_segments = non_instructional_segments or []
+        if not self.anthropic_client and not self.gemini_client:
+            raise ValueError("No API client configured.")
         is_partial = self._detect_partial_course(non_instructional_segments, evaluated_segments)
         if is_partial:
             logger.info(
@@ -899,8 +1179,6 @@ CALIBRATION GUARDS — apply before committing any score:
                     "Gemini",
                     1
                 )
-            else:
-                raise ValueError("No API client configured.")
         except Exception as e:
             logger.error(f"[Course Gate] Course evaluation failed after all retries: {e}")
             return self._make_incomplete_course_assessment(), is_partial
@@ -1,5 +1,8 @@
 import logging
 from pathlib import Path
+
+import orjson
+
 from src.models import CourseEvaluation
 
 logger = logging.getLogger(__name__)
@@ -29,9 +32,13 @@ class JSONExporter:
         
         logger.info(f"Exporting verbose Segment JSON payload to: {output_path}")
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                # model_dump_json handles standard python serialization for pydantic models
-                f.write(evaluation.model_dump_json(indent=2))
+            with open(output_path, 'wb') as f:
+                # orjson serializes the dumped model to UTF-8 bytes directly,
+                # skipping the intermediate str + encode round-trip.
+                f.write(orjson.dumps(
+                    evaluation.model_dump(mode='json'),
+                    option=orjson.OPT_INDENT_2,
+                ))
             logger.info("JSON file reliably written.")
         except Exception as e:
             logger.error(f"IO Error writing to disk: {e}")
@@ -1,8 +1,9 @@
 import argparse
 import logging
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from dotenv import load_dotenv
 
 
 def setup_logging(output_dir: Path) -> logging.Logger:
@@ -29,7 +30,152 @@ def setup_logging(output_dir: Path) -> logging.Logger:
     return logger
 
 
+def process_one_pdf(pdf_path: Path, args: argparse.Namespace, evaluator=None) -> bool:
+    """Run the full 5-step pipeline (metadata → segment → evaluate → aggregate
+    → export) for a single PDF.
+
+    Top-level so it is picklable for --jobs worker processes. When called
+    without an evaluator (the worker case) it constructs and closes its own;
+    the sequential path passes the shared one in. Returns True on success —
+    failures are logged, never raised, so one bad PDF cannot sink a corpus run.
+    """
+    from src.metadata import MetadataIngestor
+    from src.segmenter import SmartSegmenter
+    from src.evaluator import LLMEvaluator
+    from src.aggregator import ScoreAggregator
+    from src.exporter import JSONExporter
+
+    output_dir = Path(args.output)
+    logger = logging.getLogger("SemanticFlowEvaluator")
+    if not logger.handlers:
+        # Worker process: the parent's handlers are not inherited.
+        setup_logging(output_dir)
+
+    owns_evaluator = evaluator is None
+    try:
+        if owns_evaluator:
+            evaluator = LLMEvaluator(
+                Path(args.config), preferred_model=args.model, use_cache=not args.no_cache
+            )
+        aggregator = ScoreAggregator()
+        exporter = JSONExporter(output_dir)
+        model_string = "Claude 3.5 Sonnet" if args.model == 'claude' else "Gemini-2.5-Flash"
+
+        logger.info(f"--- Processing: {pdf_path.name} ---")
+
+        # Step 1: Metadata
+        logger.info("Step 1/5: Metadata Extraction")
+        metadata_ingestor = MetadataIngestor(
+            course_pdf_path=pdf_path,
+            metadata_source=args.metadata,
+            use_ai=args.ai,
+            preferred_model=args.model,
+        )
+        metadata = metadata_ingestor.ingest()
+
+        # Step 2: Segmentation (ADR-039: pass metadata so segmenter can
+        # validate tier chapter counts against the parsed TOC)
+        logger.info("Step 2/5: Deterministic Segmentation")
+        segmenter = SmartSegmenter(
+            pdf_path, course_metadata=metadata, use_cache=not args.no_cache
+        )
+        segments = segmenter.segment()
+
+        if args.limit > 0:
+            logger.info(f"Limiting evaluation to first {args.limit} segments for testing.")
+            segments = segments[:args.limit]
+
+        # Step 3: Module Gate — batch evaluation (6 rubrics + per-segment summaries)
+        logger.info(f"Step 3/5: Module Gate Evaluation ({len(segments)} segments)")
+        evaluated_segments = []
+
+        batch_size = max(1, args.batch_size)
+        batches = [segments[i:i + batch_size] for i in range(0, len(segments), batch_size)]
+        total_batches = len(batches)
+        concurrency = max(1, args.concurrency)
+        if concurrency > 1:
+            logger.info(
+                f"  [Module Gate] Evaluating batches in parallel waves of {concurrency}. "
+                f"Cross-batch context (ADR-030) is shared between waves, not within one."
+            )
+
+        # Batches are dispatched in waves of `concurrency`. Each LLM call is
+        # I/O-bound, so threads overlap the network wait; batches within a
+        # wave see only the summaries accumulated by earlier waves.
+        previous_summaries = []
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for wave_start in range(0, total_batches, concurrency):
+                wave = batches[wave_start:wave_start + concurrency]
+                logger.info(
+                    f"  [Module Gate] Batches {wave_start + 1}-{wave_start + len(wave)}"
+                    f"/{total_batches} ({sum(len(b) for b in wave)} segments)"
+                )
+                context = list(previous_summaries)
+                wave_results = list(pool.map(
+                    lambda batch: evaluator.evaluate_batch(
+                        metadata, batch, previous_summaries=context
+                    ),
+                    wave,
+                ))
+                for eval_batch in wave_results:
+                    evaluated_segments.extend(eval_batch)
+                    previous_summaries.extend(
+                        seg.summary for seg in eval_batch if getattr(seg, "summary", None)
+                    )
+
+        # Step 4: Course Gate — single capstone call (holistic rubrics)
+        # Skip if no instructional segments exist: scoring from metadata alone is misleading.
+        has_instructional = any(s.segment_type == "instructional" for s in segments)
+        non_instructional_raw = [s for s in segments if s.segment_type != "instructional"]
+        if not has_instructional:
+            logger.warning(
+                "Step 4/5: Course Gate skipped — no instructional segments found. "
+                "Course Gate requires module content summaries to give meaningful scores."
+            )
+            course_assessment = evaluator._make_incomplete_course_assessment()
+            is_partial_course = False
+        else:
+            logger.info("Step 4/5: Course Gate Evaluation (capstone)")
+            course_assessment, is_partial_course = evaluator.evaluate_course(
+                metadata=metadata,
+                evaluated_segments=evaluated_segments,
+                non_instructional_segments=non_instructional_raw,
+            )
+            if is_partial_course:
+                logger.info(
+                    "[Course Gate] File identified as a partial course fragment — "
+                    "scoring adjusted to avoid penalising absent modules."
+                )
+
+        # Step 5: Aggregate & Export
+        logger.info("Step 5/5: Aggregation and Export")
+        course_eval = aggregator.aggregate(
+            metadata=metadata,
+            segments=evaluated_segments,
+            course_assessment=course_assessment,
+            model_used=model_string,
+        )
+        output_file = exporter.export(course_eval)
+
+        logger.info(f"Successfully evaluated {pdf_path.name} -> {output_file.name}")
+        return True
+
+    except Exception:
+        # exception() logs the message and the traceback in one record;
+        # a preceding error() call emitted the same failure twice.
+        logger.exception(f"Failed processing {pdf_path.name}")
+        return False
+
+    finally:
+        if owns_evaluator and evaluator is not None:
+            evaluator.close()
+
+
 def main():
+    # Imported here (like the pipeline modules in process_one_pdf) so that
+    # `import src.main` and --help stay free of third-party import cost.
+    from dotenv import load_dotenv
+
     load_dotenv()
     parser = argparse.ArgumentParser(description="SemanticFlow Pedagogical Evaluator")
     parser.add_argument("--input", type=str, required=True, help="Path to input directory containing courses (PDFs)")
@@ -43,6 +189,39 @@ def main():
         default='claude',
         help='LLM model to use for evaluation (default: claude)'
     )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=5,
+        help='Segments per Module Gate API call (default: 5). Larger batches amortize '
+             'the rubric system prompt over more segments per call; very large values '
+             'risk output-token truncation on long segments.'
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=1,
+        help='Number of Module Gate batches to evaluate in parallel (default: 1 = sequential). '
+             'Values >1 speed up I/O-bound LLM calls but share ADR-030 cross-batch '
+             'context only at wave granularity.'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Number of PDFs to process in parallel worker processes (default: 1 = '
+             'sequential). Each PDF is independent, so this scales segmentation and '
+             'extraction across cores; combine with --concurrency for the LLM calls.'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        default=False,
+        help='Disable the persistent caches under ~/.cache/semantic_flow. By default, '
+             'segmentation output is replayed for unchanged PDFs, and Module Gate '
+             'segments whose text, rubrics, and model match a previous run are '
+             'replayed from disk instead of re-calling the API.'
+    )
     parser.add_argument(
         '--metadata',
         type=str,
@@ -81,110 +260,52 @@ def main():
     # Accept --input as either a directory or a single .pdf file
     if input_path.is_file() and input_path.suffix.lower() == ".pdf":
         pdfs = [input_path]
-    else:
-        pdfs = sorted(input_path.glob("*.pdf"))
+    elif input_path.is_dir():
+        # os.scandir over glob: DirEntry.is_file() is answered from readdir's
+        # d_type, so large directories are enumerated without a stat() per
+        # entry, and the suffix check also matches uppercase .PDF extensions.
+        with os.scandir(input_path) as entries:
+            pdfs = sorted(
+                Path(entry.path)
+                for entry in entries
+                if entry.is_file() and entry.name.lower().endswith(".pdf")
+            )
         if not pdfs:
             logger.warning(f"No PDFs found in {input_path}")
             sys.exit(0)
+    else:
+        # An existing file that isn't a .pdf — mirror the empty-directory exit
+        # rather than letting os.scandir raise NotADirectoryError.
+        logger.warning(f"No PDFs found in {input_path}")
+        sys.exit(0)
 
     logger.info(f"Found {len(pdfs)} PDF(s) to process.")
 
-    from src.metadata import MetadataIngestor
-    from src.segmenter import SmartSegmenter
-    from src.evaluator import LLMEvaluator
-    from src.aggregator import ScoreAggregator
-    from src.exporter import JSONExporter
-
-    try:
-        evaluator = LLMEvaluator(config_path, preferred_model=args.model)
-    except Exception as e:
-        logger.error(f"Failed to initialize evaluator: {e}")
-        sys.exit(1)
-
-    aggregator = ScoreAggregator()
-    exporter = JSONExporter(output_dir)
-    model_string = "Claude 3.5 Sonnet" if args.model == 'claude' else "Gemini-2.5-Flash"
+    jobs = max(1, args.jobs)
+    if jobs > 1 and len(pdfs) > 1:
+        jobs = min(jobs, len(pdfs))
+        logger.info(f"Processing PDFs in {jobs} parallel worker processes.")
+        # Workers build their own clients/evaluators; failures are handled
+        # inside process_one_pdf, so result() only surfaces worker crashes.
+        with ProcessPoolExecutor(max_workers=jobs) as procs:
+            futures = {procs.submit(process_one_pdf, pdf, args): pdf for pdf in pdfs}
+            for future in as_completed(futures):
+                future.result()
+    else:
+        from src.evaluator import LLMEvaluator
 
-    for pdf_path in pdfs:
         try:
-            logger.info(f"--- Processing: {pdf_path.name} ---")
-
-            # Step 1: Metadata
-            logger.info("Step 1/5: Metadata Extraction")
-            metadata_ingestor = MetadataIngestor(
-                course_pdf_path=pdf_path,
-                metadata_source=args.metadata,
-                use_ai=args.ai,
-                preferred_model=args.model,
+            evaluator = LLMEvaluator(
+                config_path, preferred_model=args.model, use_cache=not args.no_cache
             )
-            metadata = metadata_ingestor.ingest()
-
-            # Step 2: Segmentation (ADR-039: pass metadata so segmenter can
-            # validate tier chapter counts against the parsed TOC)
-            logger.info("Step 2/5: Deterministic Segmentation")
-            segmenter = SmartSegmenter(pdf_path, course_metadata=metadata)
-            segments = segmenter.segment()
-
-            if args.limit > 0:
-                logger.info(f"Limiting evaluation to first {args.limit} segments for testing.")
-                segments = segments[:args.limit]
-
-            # Step 3: Module Gate — batch evaluation (6 rubrics + per-segment summaries)
-            logger.info(f"Step 3/5: Module Gate Evaluation ({len(segments)} segments)")
-            evaluated_segments = []
-
-            BATCH_SIZE = 5
-            total_batches = (len(segments) + BATCH_SIZE - 1) // BATCH_SIZE
-            previous_summaries = []
-            for i in range(0, len(segments), BATCH_SIZE):
-                batch = segments[i:i + BATCH_SIZE]
-                batch_num = i // BATCH_SIZE + 1
-                logger.info(f"  [Module Gate] Batch {batch_num}/{total_batches} ({len(batch)} segments)")
-                eval_batch = evaluator.evaluate_batch(metadata, batch, previous_summaries=previous_summaries)
-                evaluated_segments.extend(eval_batch)
-                previous_summaries.extend(
-                    seg.summary for seg in eval_batch if getattr(seg, "summary", None)
-                )
-
-            # Step 4: Course Gate — single capstone call (holistic rubrics)
-            # Skip if no instructional segments exist: scoring from metadata alone is misleading.
-            has_instructional = any(s.segment_type == "instructional" for s in segments)
-            non_instructional_raw = [s for s in segments if s.segment_type != "instructional"]
-            if not has_instructional:
-                logger.warning(
-                    "Step 4/5: Course Gate skipped — no instructional segments found. "
-                    "Course Gate requires module content summaries to give meaningful scores."
-                )
-                course_assessment = evaluator._make_incomplete_course_assessment()
-                is_partial_course = False
-            else:
-                logger.info("Step 4/5: Course Gate Evaluation (capstone)")
-                course_assessment, is_partial_course = evaluator.evaluate_course(
-                    metadata=metadata,
-                    evaluated_segments=evaluated_segments,
-                    non_instructional_segments=non_instructional_raw,
-                )
-                if is_partial_course:
-                    logger.info(
-                        "[Course Gate] File identified as a partial course fragment — "
-                        "scoring adjusted to avoid penalising absent modules."
-                    )
-
-            # Step 5: Aggregate & Export
-            logger.info("Step 5/5: Aggregation and Export")
-            course_eval = aggregator.aggregate(
-                metadata=metadata,
-                segments=evaluated_segments,
-                course_assessment=course_assessment,
-                model_used=model_string,
-            )
-            output_file = exporter.export(course_eval)
+        except Exception as e:
+            logger.error(f"Failed to initialize evaluator: {e}")
+            sys.exit(1)
 
-            logger.info(f"Successfully evaluated {pdf_path.name} -> {output_file.name}")
+        for pdf_path in pdfs:
+            process_one_pdf(pdf_path, args, evaluator=evaluator)
 
-        except Exception as e:
-            logger.error(f"Failed processing {pdf_path.name}: {e}")
-            logger.exception(e)
+        evaluator.close()
 
     logger.info("Evaluation pipeline completely finished.")
 
@@ -16,16 +16,20 @@ defense against body-text corruption). `_merge_heuristic_and_llm()` fills any
 still-empty scalar with the heuristic candidate.
 """
 
-import json
+import functools
+import hashlib
 import logging
 import os
+import random
 import re
 import time
 import urllib.request
 import urllib.error
+from collections import Counter
+from html.parser import HTMLParser
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
-import pdfplumber
+import orjson
 from pydantic import BaseModel, Field, field_validator
 
 logger = logging.getLogger(__name__)
@@ -66,15 +70,23 @@ _SUBJECT_PATTERNS = [
                re.IGNORECASE | re.MULTILINE),
 ]
 
-_DESCRIPTION_PATTERNS = [
-    re.compile(r'About\s+[\w\s]+?\n\s*([A-Z][^.]{30,400}\.)', re.DOTALL),
-    re.compile(
-        r'(?:this\s+(?:book|textbook|text|course|resource))\s+'
-        r'(?:provides?|covers?|introduces?|is\s+designed\s+to|aims?\s+to)\s+'
-        r'([^.]{30,350}\.)', re.IGNORECASE
-    ),
-    re.compile(r'(?:Preface|Introduction)\s*\n+([A-Z][^\n]{50,400})', re.DOTALL),
-]
+# Description scan as one alternation: the three patterns used to each walk
+# the full cover+15-page buffer from position 0; a single finditer pass
+# collects the first hit per named group, and selection afterwards still
+# honours the original pattern-priority order (_DESC_GROUP_PRIORITY).
+# The About branch is bounded line-by-line: the old `[\w\s]+?` lazy run
+# included newlines, so a non-matching "About" forced a re-check of the
+# lookahead at every character to the end of the buffer (quadratic on
+# about-heavy pages). Header lines are now capped at 100 chars and 3 lines.
+_DESC_COMBINED_PATTERN = re.compile(
+    r'About[ \t]+[\w \t]{1,100}\n(?:[\w \t]{1,100}\n){0,2}'
+    r'\s*(?P<about>[A-Z][^.]{30,400}\.)'
+    r'|(?i:(?:this\s+(?:book|textbook|text|course|resource))\s+'
+    r'(?:provides?|covers?|introduces?|is\s+designed\s+to|aims?\s+to)\s+'
+    r'(?P<blurb>[^.]{30,350}\.))'
+    r'|(?:Preface|Introduction)\s*\n+(?P<preface>[A-Z][^\n]{50,400})'
+)
+_DESC_GROUP_PRIORITY = ("about", "blurb", "preface")
 
 # OS/tool-generated usernames that should never be treated as real authors
 _GARBAGE_AUTHOR_RE = re.compile(
@@ -95,6 +107,8 @@ _TITLE_LABEL_RE = re.compile(
     r'|course\s+material|handout|notes?)\s*$',
     re.IGNORECASE,
 )
+# Empty bracket pairs left behind after course-code stripping
+_EMPTY_BRACKETS_RE = re.compile(r'\[\s*\]')
 
 # ── TOC heuristic regex (ADR-038) ─────────────────────────────────────────────
 # Matches lines like:
@@ -116,6 +130,20 @@ _TOC_HEADING_RE = re.compile(
     r"^\s*(contents|table\s+of\s+contents|index)\s*$", re.IGNORECASE
 )
 
+# ── TXT metadata parser (`key: value` lines) ──────────────────────────────────
+# One anchored match per line captures a trimmed key and value together,
+# replacing the split/strip/strip chain; str.translate normalises key
+# separators in a single C-level pass.
+_TXT_KV_RE = re.compile(r"^\s*([A-Za-z _-]+?)\s*:\s*(.*?)\s*$")
+_TXT_KEY_TRANS = str.maketrans(" -", "__")
+_TXT_LIST_KEYS = frozenset({
+    "prerequisites_stated",
+    "prerequisites_inferred",
+    "learning_outcomes_stated",
+    "learning_outcomes_inferred",
+    "contributing_authors",
+})
+
 _ALLOWED_LEVELS = {
     "",
     "introductory",
@@ -211,6 +239,13 @@ class CourseMetadata(BaseModel):
         return v
 
 
+# Field-name set for filtering untrusted dicts down to CourseMetadata keys.
+# Computed once: the per-call `k in CourseMetadata.model_fields` checks cost a
+# class-attribute lookup each time, and `dict.keys() & frozenset` intersects at
+# C level instead of looping in Python.
+_METADATA_FIELDS = frozenset(CourseMetadata.model_fields)
+
+
 # ── LLM enrichment prompt (ADR-038, single call) ──────────────────────────────
 
 _METADATA_SYSTEM_PROMPT = """
@@ -280,6 +315,39 @@ Required JSON schema (return exactly this shape, no markdown fences):
 
 # ── AI metadata extractor (single-call, Gemini primary / Claude fallback) ─────
 
+# Exact-key disk cache for LLM metadata responses, a sibling of the
+# evaluator's Module Gate cache. Keyed on the system prompt, model ids, and
+# the (truncated) per-PDF input text, so re-ingesting an unchanged PDF skips
+# the provider call entirely; editing the prompt or models invalidates.
+_METADATA_CACHE_DIR = Path.home() / ".cache" / "semantic_flow" / "metadata"
+
+_HSPACE_RUN_RE = re.compile(r"[ \t]{2,}")
+
+
+def _compress_front_matter(text: str) -> str:
+    """Strip zero-signal lines from front-matter text before the token-metered
+    LLM call: running headers/footers (the same line repeated on >3 pages),
+    bare page numbers, and consecutive duplicate lines. Horizontal whitespace
+    runs collapse to single spaces. Signal lines pass through untouched, so
+    the cover-only author/publisher rule still sees its source text.
+    """
+    lines = text.splitlines()
+    freq = Counter(ln.strip() for ln in lines if ln.strip())
+    out: List[str] = []
+    prev: Optional[str] = None
+    for ln in lines:
+        stripped = ln.strip()
+        if stripped:
+            if stripped.isdigit():
+                continue
+            if freq[stripped] > 3:
+                continue
+            if stripped == prev:
+                continue
+        out.append(_HSPACE_RUN_RE.sub(" ", ln))
+        prev = stripped
+    return "\n".join(out)
+
 
 class AIMetadataExtractor:
     """Single-call metadata enrichment (ADR-038, Q-029).
@@ -348,6 +416,12 @@ class AIMetadataExtractor:
 
         user_prompt = self._build_user_prompt(raw_text_15, cover_text)
 
+        cache_key = self._cache_key(user_prompt)
+        cached = self._cache_load(cache_key)
+        if cached is not None:
+            logger.info("AI metadata: disk cache hit — skipping LLM call.")
+            return cached
+
         # Gemini first (ADR-038, Q-029)
         response_text = self._try_gemini(user_prompt)
         if response_text is None:
@@ -360,15 +434,60 @@ class AIMetadataExtractor:
             logger.error("AI metadata: all providers failed.")
             return None
 
-        return self._parse_response(response_text)
+        parsed = self._parse_response(response_text)
+        if parsed is not None:
+            self._cache_store(cache_key, parsed)
+        return parsed
+
+    # ── Response cache ────────────────────────────────────────────────────
+
+    def _cache_key(self, user_prompt: str) -> str:
+        return hashlib.sha256(
+            "\x1f".join(
+                (
+                    _METADATA_SYSTEM_PROMPT,
+                    self.GEMINI_MODEL,
+                    self.CLAUDE_MODEL,
+                    user_prompt,
+                )
+            ).encode("utf-8")
+        ).hexdigest()
+
+    @staticmethod
+    def _cache_load(cache_key: str) -> Optional[CourseMetadata]:
+        """Load a cached CourseMetadata, or None on miss/corruption."""
+        cache_path = _METADATA_CACHE_DIR / f"{cache_key}.json"
+        try:
+            return CourseMetadata.model_validate(
+                orjson.loads(cache_path.read_bytes())
+            )
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(
+                f"Discarding unreadable metadata cache entry {cache_path.name}: {e}"
+            )
+            return None
+
+    @staticmethod
+    def _cache_store(cache_key: str, metadata: CourseMetadata) -> None:
+        """Persist a parsed LLM response; cache write failures are non-fatal."""
+        try:
+            _METADATA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            (_METADATA_CACHE_DIR / f"{cache_key}.json").write_bytes(
+                orjson.dumps(metadata.model_dump(mode="json"))
+            )
+        except Exception as e:
+            logger.warning(f"Could not write metadata cache entry: {e}")
 
     # ── Prompt construction ───────────────────────────────────────────────
 
     @staticmethod
     def _build_user_prompt(raw_text_15: str, cover_text: str) -> str:
-        # Cap sizes conservatively to stay well within context limits.
-        cover_trimmed = cover_text[:6000]
-        raw_trimmed = raw_text_15[:15000]
+        # Compress first, then cap sizes conservatively to stay well within
+        # context limits — compression means the caps keep more signal text.
+        cover_trimmed = _compress_front_matter(cover_text)[:6000]
+        raw_trimmed = _compress_front_matter(raw_text_15)[:15000]
         return (
             "<cover_text>\n"
             f"{cover_trimmed}\n"
@@ -382,6 +501,26 @@ class AIMetadataExtractor:
 
     # ── Providers ─────────────────────────────────────────────────────────
 
+    @staticmethod
+    def _retry_wait(exc: Exception, attempt: int) -> float:
+        """Jittered exponential backoff, raised to the server's Retry-After
+        hint when the exception carries one (SDK errors expose the HTTP
+        response on 429/503). Jitter keeps parallel --jobs workers that share
+        a rate-limit bucket from re-colliding in lockstep."""
+        wait = AIMetadataExtractor.RETRY_BACKOFF * (2 ** (attempt - 1))
+        # Jitter the backoff term only: the Retry-After hint is a server-
+        # mandated floor and must not be undercut by downward jitter.
+        wait *= random.uniform(0.7, 1.3)
+        headers = getattr(getattr(exc, "response", None), "headers", None)
+        if headers:
+            try:
+                hint = float(headers.get("retry-after"))
+            except (TypeError, ValueError):
+                hint = None
+            if hint is not None:
+                wait = max(wait, hint)
+        return wait
+
     def _try_gemini(self, user_prompt: str) -> Optional[str]:
         if self._gemini_client is None:
             return None
@@ -405,9 +544,9 @@ class AIMetadataExtractor:
                 )
                 return resp.text
             except Exception as e:
-                wait = self.RETRY_BACKOFF * (2 ** (attempt - 1))
+                wait = self._retry_wait(e, attempt)
                 logger.warning(
-                    f"Gemini attempt {attempt} failed: {e}. Waiting {wait}s."
+                    f"Gemini attempt {attempt} failed: {e}. Waiting {wait:.1f}s."
                 )
                 if attempt < self.MAX_RETRIES:
                     time.sleep(wait)
@@ -425,14 +564,31 @@ class AIMetadataExtractor:
                     model=self.CLAUDE_MODEL,
                     max_tokens=self.MAX_OUTPUT_TOKENS,
                     temperature=0.0,
-                    system=_METADATA_SYSTEM_PROMPT,
+                    # Static system prompt as a cache-marked block: follow-up
+                    # calls within the cache TTL read it at reduced input cost
+                    # instead of re-billing the full prompt (same pattern as
+                    # the evaluator's Module/Course Gate calls).
+                    system=[
+                        {
+                            "type": "text",
+                            "text": _METADATA_SYSTEM_PROMPT,
+                            "cache_control": {"type": "ephemeral"},
+                        }
+                    ],
                     messages=[{"role": "user", "content": user_prompt}],
                 )
+                usage = getattr(resp, "usage", None)
+                if usage is not None:
+                    logger.info(
+                        "AI metadata: Claude cache "
+                        f"read={getattr(usage, 'cache_read_input_tokens', 0)} "
+                        f"created={getattr(usage, 'cache_creation_input_tokens', 0)} tokens."
+                    )
                 return resp.content[0].text
             except Exception as e:
-                wait = self.RETRY_BACKOFF * (2 ** (attempt - 1))
+                wait = self._retry_wait(e, attempt)
                 logger.warning(
-                    f"Claude attempt {attempt} failed: {e}. Waiting {wait}s."
+                    f"Claude attempt {attempt} failed: {e}. Waiting {wait:.1f}s."
                 )
                 if attempt < self.MAX_RETRIES:
                     time.sleep(wait)
@@ -440,16 +596,60 @@ class AIMetadataExtractor:
 
     # ── Response parsing ──────────────────────────────────────────────────
 
+    @staticmethod
+    def _extract_json_object(text: str) -> Optional[str]:
+        """Slice the first brace-balanced JSON object out of `text`.
+
+        Handles fenced ```json blocks, leading prose, and trailing
+        commentary alike — everything outside the balanced braces is
+        ignored. Returns None if no complete object is present.
+        """
+        start = text.find("{")
+        if start == -1:
+            return None
+        depth = 0
+        in_string = False
+        escaped = False
+        for i in range(start, len(text)):
+            ch = text[i]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == "\\":
+                    escaped = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = True
+            elif ch == "{":
+                depth += 1
+            elif ch == "}":
+                depth -= 1
+                if depth == 0:
+                    return text[start : i + 1]
+        return None
+
     @staticmethod
     def _parse_response(text: str) -> Optional[CourseMetadata]:
-        clean = re.sub(r"```(?:json)?\s*", "", text).strip().rstrip("`")
         try:
-            data = json.loads(clean)
-        except json.JSONDecodeError as e:
-            logger.error(
-                f"AI metadata response was not valid JSON: {e}\nRaw: {text[:300]}"
-            )
-            return None
+            data = orjson.loads(text)
+        except orjson.JSONDecodeError:
+            # Salvage pass: fenced blocks and pre/post-object commentary are
+            # the common failure shapes; both fall to the brace extractor.
+            candidate = AIMetadataExtractor._extract_json_object(text)
+            if candidate is None:
+                logger.error(
+                    f"AI metadata response contained no JSON object.\n"
+                    f"Raw: {text[:300]}"
+                )
+                return None
+            try:
+                data = orjson.loads(candidate)
+            except orjson.JSONDecodeError as e:
+                logger.error(
+                    f"AI metadata response was not valid JSON: {e}\nRaw: {text[:300]}"
+                )
+                return None
 
         # Coerce null/missing scalars to ""; null/missing lists to []
         scalar_fields = (
@@ -506,7 +706,7 @@ class AIMetadataExtractor:
         data["toc"] = clean_toc
 
         # Drop any keys that are not part of the schema before constructing
-        filtered = {k: v for k, v in data.items() if k in CourseMetadata.model_fields}
+        filtered = {k: data[k] for k in data.keys() & _METADATA_FIELDS}
         try:
             return CourseMetadata(**filtered)
         except Exception as e:
@@ -514,6 +714,19 @@ class AIMetadataExtractor:
             return None
 
 
+@functools.lru_cache(maxsize=2)
+def _shared_ai_extractor(
+    anthropic_key: Optional[str], gemini_key: Optional[str]
+) -> AIMetadataExtractor:
+    """Process-wide AIMetadataExtractor, built once per key pair.
+
+    Constructing the extractor per PDF created a fresh SDK client — and a
+    fresh HTTP connection pool plus TLS handshake — for every ingest; batch
+    runs now reuse one client and its keep-alive connections.
+    """
+    return AIMetadataExtractor(anthropic_key=anthropic_key, gemini_key=gemini_key)
+
+
 # ── Heuristic phase (ADR-038) ─────────────────────────────────────────────────
 
 
@@ -663,6 +876,11 @@ def _extract_heuristic_metadata(pdf_path: Path) -> Dict[str, Any]:
         "legacy_isbn": "",
     }
 
+    # Imported here rather than at module top: pdfplumber drags in
+    # pdfminer.six and Pillow, and the external JSON/TXT/HTML/URL metadata
+    # paths never touch a PDF.
+    import pdfplumber
+
     try:
         with pdfplumber.open(pdf_path) as pdf:
             result["pdf_properties"] = pdf.metadata or {}
@@ -670,22 +888,25 @@ def _extract_heuristic_metadata(pdf_path: Path) -> Dict[str, Any]:
             first_15 = pdf.pages[:15]
             cover_pages = pdf.pages[:3]
 
-            # Cover text (for author / publisher / font-title)
+            # Single pass over the first 15 pages: the cover text (layout-
+            # preserving, for author/publisher line patterns) and the body-
+            # cropped raw text are accumulated together, so pages 0-2 are
+            # visited once instead of by two separate loops.
             cover_parts: List[str] = []
-            for page in cover_pages:
-                text = page.extract_text() or ""
-                if not text.strip():
-                    try:
-                        words = page.extract_words()
-                        text = " ".join(w["text"] for w in words)
-                    except Exception:
-                        text = ""
-                cover_parts.append(text)
-            result["cover_text"] = "\n".join(cover_parts)
-
-            # Raw 15-page text (body-cropped to remove headers/footers)
             raw_parts: List[str] = []
-            for page in first_15:
+            for idx, page in enumerate(first_15):
+                if idx < 3:
+                    # Cover text (for author / publisher / font-title)
+                    text = page.extract_text() or ""
+                    if not text.strip():
+                        try:
+                            words = page.extract_words()
+                            text = " ".join(w["text"] for w in words)
+                        except Exception:
+                            text = ""
+                    cover_parts.append(text)
+
+                # Raw 15-page text (body-cropped to remove headers/footers)
                 try:
                     H, W = float(page.height), float(page.width)
                     body = page.within_bbox((0, H * 0.08, W, H * 0.93))
@@ -693,6 +914,7 @@ def _extract_heuristic_metadata(pdf_path: Path) -> Dict[str, Any]:
                     raw_parts.append(" ".join(w["text"] for w in words))
                 except Exception:
                     raw_parts.append(page.extract_text() or "")
+            result["cover_text"] = "\n".join(cover_parts)
             result["raw_text_15"] = "\n".join(raw_parts)
 
             # pdftotext fallback for CIDFont/Type3 PDFs
@@ -734,30 +956,46 @@ def _extract_heuristic_metadata(pdf_path: Path) -> Dict[str, Any]:
             # Heuristic TOC
             result["toc_candidates"] = _extract_toc_heuristic(first_15)
 
-            # Legacy fields for backwards compat (subject/description/year/isbn)
-            combined = result["cover_text"] + "\n\n" + result["raw_text_15"]
+            # Legacy fields for backwards compat (subject/description/year/isbn).
+            # Cover and raw text are scanned in place, cover first — no pattern
+            # needs to match across the boundary, so there is no reason to
+            # allocate a cover+raw concatenation per ingest.
+            raw_text = result["raw_text_15"]
+            scan_bufs = (cover_text, raw_text)
 
             for pat in _SUBJECT_PATTERNS:
-                m = pat.search(combined)
+                m = pat.search(cover_text) or pat.search(raw_text)
                 if m:
                     result["legacy_subject"] = m.group(1).strip().rstrip(".,")
                     break
 
-            for pat in _DESCRIPTION_PATTERNS:
-                m = pat.search(combined)
-                if m:
-                    raw = m.group(1).strip()
-                    if len(raw) >= 30 and not raw.lower().startswith(
-                        ("access for free", "if you")
-                    ):
-                        result["legacy_description"] = raw[:400]
-                        break
-
-            m = _ISBN_PATTERN.search(combined)
+            desc_by_group: Dict[str, str] = {}
+            for buf in scan_bufs:
+                for m in _DESC_COMBINED_PATTERN.finditer(buf):
+                    name = m.lastgroup
+                    if name and name not in desc_by_group:
+                        desc_by_group[name] = m.group(name)
+                if len(desc_by_group) == len(_DESC_GROUP_PRIORITY):
+                    break
+            for name in _DESC_GROUP_PRIORITY:
+                raw = desc_by_group.get(name, "").strip()
+                if (
+                    len(raw) >= 30
+                    and not raw.lower().startswith(("access for free", "if you"))
+                ):
+                    result["legacy_description"] = raw[:400]
+                    break
+
+            m = _ISBN_PATTERN.search(cover_text) or _ISBN_PATTERN.search(raw_text)
             if m:
                 result["legacy_isbn"] = m.group(1).strip()
 
-            years = _YEAR_PATTERN.findall(combined[:2000])
+            # Year scan keeps the old 2000-char window: all of the cover,
+            # then the start of the raw text for whatever budget remains.
+            years = _YEAR_PATTERN.findall(cover_text[:2000])
+            year_budget = 2000 - len(cover_text) - 2
+            if year_budget > 0:
+                years += _YEAR_PATTERN.findall(raw_text[:year_budget])
             if years:
                 result["legacy_year"] = max(years)
 
@@ -771,12 +1009,11 @@ def _extract_title_by_font(pages) -> Optional[str]:
     """Find the largest-font text block on the given cover pages.
     Works for OpenStax, Pearson, Springer, O'Reilly, etc.
     """
-    best_size = 0.0
-    best_text: Optional[str] = None
-
-    page_list = list(pages)
-
-    for page in page_list:
+    # Extract words once per page: pdfplumber's layout analysis is the
+    # expensive part, so the max-size scan and the threshold collection below
+    # share one (size, text) list instead of re-extracting per pass.
+    sized_words: List[Tuple[float, str]] = []
+    for page in pages:
         try:
             words = page.extract_words(extra_attrs=["size"])
         except Exception:
@@ -786,28 +1023,21 @@ def _extract_title_by_font(pages) -> Optional[str]:
                 size = float(w.get("size", 0))
             except (TypeError, ValueError):
                 continue
-            text = (w.get("text") or "").strip()
-            if size > best_size and len(text) >= 2 and text.isascii():
-                best_size = size
-                best_text = text
+            sized_words.append((size, w.get("text") or ""))
+
+    best_size = 0.0
+    best_text: Optional[str] = None
+    for size, raw_text in sized_words:
+        text = raw_text.strip()
+        if size > best_size and len(text) >= 2 and text.isascii():
+            best_size = size
+            best_text = text
 
     if not best_text or best_size < 14:
         return None
 
     threshold = best_size * 0.90
-    title_words: List[str] = []
-    for page in page_list:
-        try:
-            words = page.extract_words(extra_attrs=["size"])
-        except Exception:
-            continue
-        for w in words:
-            try:
-                size = float(w.get("size", 0))
-            except (TypeError, ValueError):
-                continue
-            if size >= threshold:
-                title_words.append(w.get("text", ""))
+    title_words = [raw for size, raw in sized_words if size >= threshold]
 
     if title_words:
         candidate = " ".join(title_words)
@@ -869,7 +1099,7 @@ def _apply_pdf_properties(
         if title.lower() != pdf_path.stem.lower():
             title = _COURSE_CODE_RE.sub(" ", title).strip()
             title = _TITLE_LABEL_RE.sub("", title).strip()
-            title = re.sub(r"\[\s*\]", "", title).strip()
+            title = _EMPTY_BRACKETS_RE.sub("", title).strip()
             if len(title) >= 3:
                 metadata.title = title
 
@@ -944,6 +1174,40 @@ def _merge_heuristic_and_llm(
     return llm_meta
 
 
+# ── HTML metadata parser ──────────────────────────────────────────────────────
+
+
+class _MetaHTMLParser(HTMLParser):
+    """Collects the <title> text and all <meta name|property=...> content
+    attributes from an HTML document. Used by `MetadataIngestor._parse_html`.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title_parts: List[str] = []
+        self.meta: Dict[str, str] = {}
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "title":
+            self._in_title = True
+        elif tag == "meta":
+            d = dict(attrs)
+            name = (d.get("name") or d.get("property") or "").lower()
+            content = d.get("content")
+            if name and content:
+                # First occurrence wins (matches head-precedence convention).
+                self.meta.setdefault(name, content)
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title_parts.append(data)
+
+
 # ── MetadataIngestor ──────────────────────────────────────────────────────────
 
 
@@ -981,6 +1245,9 @@ class MetadataIngestor:
         self.base_name = self.course_pdf_path.stem
         self.dir_path = self.course_pdf_path.parent
         self.use_ai = use_ai
+        # Memoized ingest() result — extraction may involve a full PDF scan
+        # and an LLM call, so repeat callers within a run get the same object.
+        self._ingested: Optional[CourseMetadata] = None
         if preferred_model and preferred_model.lower() != "gemini":
             logger.debug(
                 "preferred_model=%r is ignored under ADR-038 (Gemini primary, "
@@ -991,9 +1258,12 @@ class MetadataIngestor:
     # ── Public entry ──────────────────────────────────────────────────────
 
     def ingest(self) -> CourseMetadata:
-        if self.metadata_source:
-            return self._from_explicit_source()
-        return self._autoscan()
+        if self._ingested is None:
+            if self.metadata_source:
+                self._ingested = self._from_explicit_source()
+            else:
+                self._ingested = self._autoscan()
+        return self._ingested
 
     # ── Source routing ────────────────────────────────────────────────────
 
@@ -1045,10 +1315,7 @@ class MetadataIngestor:
                     "is set. Metadata will be heuristic-only."
                 )
             else:
-                extractor = AIMetadataExtractor(
-                    anthropic_key=anthropic_key,
-                    gemini_key=gemini_key,
-                )
+                extractor = _shared_ai_extractor(anthropic_key, gemini_key)
                 llm_meta = extractor.extract(
                     raw_text_15=heuristic["raw_text_15"],
                     cover_text=heuristic["cover_text"],
@@ -1074,16 +1341,14 @@ class MetadataIngestor:
                 self.metadata_source, headers={"User-Agent": "Mozilla/5.0"}
             )
             with urllib.request.urlopen(req, timeout=10) as r:
-                content = r.read().decode("utf-8", errors="ignore")
-                if content.strip().startswith("{"):
+                # Keep the payload as bytes: orjson decodes UTF-8 internally,
+                # so JSON responses skip the Python-level str round-trip.
+                raw = r.read()
+                if raw.lstrip()[:1] == b"{":
                     try:
-                        data = json.loads(content)
+                        data = orjson.loads(raw)
                         return CourseMetadata(
-                            **{
-                                k: v
-                                for k, v in data.items()
-                                if k in CourseMetadata.model_fields
-                            }
+                            **{k: data[k] for k in data.keys() & _METADATA_FIELDS}
                         )
                     except Exception:
                         pass
@@ -1094,11 +1359,11 @@ class MetadataIngestor:
 
     def _parse_json(self, path: Path) -> CourseMetadata:
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            filtered = {
-                k: v for k, v in data.items() if k in CourseMetadata.model_fields
-            }
+            # Binary read + orjson: the bytes are decoded once inside the parser
+            # instead of going through a Python-level UTF-8 decode first.
+            with open(path, "rb") as f:
+                data = orjson.loads(f.read())
+            filtered = {k: data[k] for k in data.keys() & _METADATA_FIELDS}
             if "source" not in filtered:
                 filtered["source"] = path.name
             return CourseMetadata(**filtered)
@@ -1108,27 +1373,19 @@ class MetadataIngestor:
 
     def _parse_txt(self, path: Path) -> CourseMetadata:
         data: Dict[str, Any] = {}
-        list_keys = {
-            "prerequisites_stated",
-            "prerequisites_inferred",
-            "learning_outcomes_stated",
-            "learning_outcomes_inferred",
-            "contributing_authors",
-        }
         try:
             with open(path, "r", encoding="utf-8") as f:
                 for line in f:
-                    if ":" not in line:
+                    m = _TXT_KV_RE.match(line)
+                    if not m:
                         continue
-                    key, val = line.split(":", 1)
-                    k = key.strip().lower().replace(" ", "_")
-                    if k in list_keys:
+                    k = m.group(1).lower().translate(_TXT_KEY_TRANS)
+                    val = m.group(2)
+                    if k in _TXT_LIST_KEYS:
                         data[k] = [v.strip() for v in val.split(",") if v.strip()]
                     else:
-                        data[k] = val.strip()
-            filtered = {
-                k: v for k, v in data.items() if k in CourseMetadata.model_fields
-            }
+                        data[k] = val
+            filtered = {k: data[k] for k in data.keys() & _METADATA_FIELDS}
             if "source" not in filtered:
                 filtered["source"] = path.name
             return CourseMetadata(**filtered)
@@ -1137,8 +1394,47 @@ class MetadataIngestor:
             return CourseMetadata(source=self.course_pdf_path.name)
 
     def _parse_html(self, path: Path) -> CourseMetadata:
-        logger.warning(f"HTML parsing not implemented for {path.name}.")
-        return CourseMetadata(source=self.course_pdf_path.name)
+        """Extract metadata from an HTML page's <title> and <meta> tags.
+
+        Handles the common conventions — plain `name=` meta tags, OpenGraph
+        `property=og:*`, and Dublin Core `DC.*` — via the stdlib HTMLParser;
+        this path is hit at most once per run, so a C parser dependency is
+        not warranted.
+        """
+        try:
+            parser = _MetaHTMLParser()
+            parser.feed(path.read_text(encoding="utf-8", errors="ignore"))
+            meta = parser.meta
+            data: Dict[str, Any] = {"source": path.name}
+
+            title = (
+                meta.get("og:title")
+                or meta.get("dc.title")
+                or " ".join("".join(parser.title_parts).split())
+            )
+            if title:
+                data["title"] = title
+            author = meta.get("author") or meta.get("dc.creator")
+            if author:
+                data["author"] = author
+            description = meta.get("description") or meta.get("og:description")
+            if description:
+                data["description"] = description
+            subject = meta.get("dc.subject") or meta.get("keywords")
+            if subject:
+                data["subject"] = subject
+            publisher = meta.get("dc.publisher") or meta.get("og:site_name")
+            if publisher:
+                data["publisher"] = publisher
+
+            if len(data) == 1:
+                logger.warning(
+                    f"No usable <title>/<meta> metadata found in {path.name}."
+                )
+            return CourseMetadata(**data)
+        except Exception as e:
+            logger.error(f"HTML parse failed: {e}")
+            return CourseMetadata(source=self.course_pdf_path.name)
 
 
 # ── Standalone CLI ────────────────────────────────────────────────────────────
@@ -1203,8 +1499,12 @@ if __name__ == "__main__":
     output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(metadata.model_dump_json(indent=2))
+    # orjson serializes the dumped model straight to UTF-8 bytes, matching
+    # the exporter's write path.
+    with open(output_path, "wb") as f:
+        f.write(
+            orjson.dumps(metadata.model_dump(mode="json"), option=orjson.OPT_INDENT_2)
+        )
 
     print(f"\nMetadata saved to: {output_path}")
     print("   Review and edit the JSON, then pass it to the evaluator:")
@@ -1,5 +1,5 @@
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 # ADR-033: Single source of truth for CourseMetadata lives in metadata.py.
 # Re-exported here so existing `from src.models import CourseMetadata` imports keep working.
@@ -22,6 +22,8 @@ class Segment(BaseModel):
 # Applied per-segment during the Module Gate evaluation.
 
 class ModuleScores(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     goal_focus: int
     text_readability: int
     pedagogical_clarity: int
@@ -30,6 +32,8 @@ class ModuleScores(BaseModel):
 
 
 class ModuleReasoning(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     goal_focus_rationale: str = ""
     text_readability_rationale: str = ""
     pedagogical_clarity_rationale: str = ""
@@ -51,6 +55,8 @@ class EvaluatedSegment(Segment):
 # Applied once, holistically, after all Module evaluations are done.
 
 class CourseScores(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     prerequisite_alignment: int
     structural_usability: int
     business_relevance: int
@@ -59,6 +65,8 @@ class CourseScores(BaseModel):
 
 
 class CourseReasoning(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     prerequisite_alignment_rationale: str = ""
     structural_usability_rationale: str = ""
     business_relevance_rationale: str = ""
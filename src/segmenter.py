@@ -1,7 +1,9 @@
+import hashlib
 import json
 import logging
 from pathlib import Path
 from typing import List, Tuple, Optional, TYPE_CHECKING
+import orjson
 import pdfplumber
 import re
 
@@ -23,6 +25,13 @@ def _word_count(text: str) -> int:
         return 0
     return len(_WORD_RE.findall(text))
 
+# Persistent segment cache (sibling of the evaluator's response cache). Keyed
+# by PDF content hash plus every knob that changes segmentation output, so an
+# unchanged PDF skips extraction entirely on re-runs. Bump the version when
+# extraction/classification heuristics change.
+_SEGMENT_CACHE_VERSION = "1"
+_SEGMENT_CACHE_DIR = Path.home() / ".cache" / "semantic_flow" / "segments"
+
 # OCR availability flag — set on first import attempt
 _OCR_AVAILABLE: Optional[bool] = None
 
@@ -244,6 +253,7 @@ class SmartSegmenter:
         max_chars: Optional[int] = None,
         min_chars: int = 600,
         bold_as_header: bool = True,
+        use_cache: bool = True,
     ):
         """Initialise the segmenter.
 
@@ -262,6 +272,9 @@ class SmartSegmenter:
             min_chars: Kept for backwards compat; unused in the word-count
                 merge path.
             bold_as_header: ADR-029 — whether bold text qualifies as a header.
+            use_cache: Enable the persistent on-disk segment cache. Re-running
+                on an unchanged PDF replays the stored segment list instead of
+                re-extracting.
         """
         self.pdf_path = Path(pdf_path)
         self.course_metadata = course_metadata
@@ -280,6 +293,85 @@ class SmartSegmenter:
         # Populated during `segment()` so `_classify_segment()` can tell whether
         # a preface-titled segment appears before chapter 1.
         self._first_chapter_block_index: Optional[int] = None
+        # Header-font threshold, computed once per document by
+        # `_compute_header_threshold()` and shared across extraction tiers.
+        self._header_threshold: Optional[float] = None
+        self._has_native_text: bool = True
+        self._cache_dir: Optional[Path] = _SEGMENT_CACHE_DIR if use_cache else None
+
+    def _compute_header_threshold(self, pdf) -> float:
+        """Median body font size × 1.4, computed once per document.
+
+        Every extraction tier needs this baseline; previously each tier
+        re-scanned all pages with `extract_words` to derive it, so a Tier 0 →
+        Tier 3 fallthrough paid the full-document pass up to four times.
+        """
+        if self._header_threshold is None:
+            all_sizes: List[float] = []
+            for page in pdf.pages:
+                words = page.extract_words(extra_attrs=["size"])
+                all_sizes.extend(w['size'] for w in words if 'size' in w)
+            all_sizes.sort()
+            self._has_native_text = bool(all_sizes)
+            median_size = all_sizes[len(all_sizes) // 2] if all_sizes else 10.0
+            self._header_threshold = median_size * 1.4
+        return self._header_threshold
+
+    # ------------------------------------------------------------------
+    # Persistent segment cache
+    # ------------------------------------------------------------------
+
+    def _segment_cache_key(self) -> str:
+        """Content-addressed key: the PDF bytes hashed together with every
+        knob that changes segmentation output — `max_words`, `bold_as_header`,
+        the metadata TOC titles (Tier 0 follows them), and the cache version.
+        """
+        h = hashlib.blake2b(digest_size=16)
+        with open(self.pdf_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        toc_titles = ""
+        if self.course_metadata is not None and getattr(
+            self.course_metadata, "toc", None
+        ):
+            toc_titles = "|".join(
+                e.title or "" for e in self.course_metadata.toc
+            )
+        params = "\x1f".join(
+            (
+                _SEGMENT_CACHE_VERSION,
+                str(self.max_words),
+                str(self.bold_as_header),
+                toc_titles,
+            )
+        )
+        h.update(params.encode("utf-8"))
+        return h.hexdigest()
+
+    def _cache_load(self, cache_path: Path) -> Optional[List[Segment]]:
+        """Load a cached segment list, or None on miss/corruption."""
+        try:
+            raw = orjson.loads(cache_path.read_bytes())
+            return [Segment.model_validate(item) for item in raw]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(
+                f"Discarding unreadable segment cache entry {cache_path.name}: {e}"
+            )
+            return None
+
+    def _cache_store(self, cache_path: Path, segments: List[Segment]) -> None:
+        """Persist the segment list; cache write failures are non-fatal."""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_bytes(
+                orjson.dumps([s.model_dump(mode="json") for s in segments])
+            )
+        except Exception as e:
+            logger.warning(
+                f"Could not write segment cache entry {cache_path.name}: {e}"
+            )
 
     def segment(self) -> List[Segment]:
         """Extract text from PDF, group by major headers, and apply fallback chunking.
@@ -299,6 +391,21 @@ class SmartSegmenter:
         """
         logger.info(f"Segmenting PDF: {self.pdf_path.name}")
 
+        cache_path: Optional[Path] = None
+        if self._cache_dir is not None:
+            try:
+                cache_path = self._cache_dir / f"{self._segment_cache_key()}.json"
+            except OSError as e:
+                logger.warning(f"Segment cache disabled for this run: {e}")
+            else:
+                cached = self._cache_load(cache_path)
+                if cached is not None:
+                    logger.info(
+                        f"Segment cache hit for {self.pdf_path.name} "
+                        f"({len(cached)} segments) — skipping extraction."
+                    )
+                    return cached
+
         # ADR-039: TOC-count validation reference
         toc_chapter_count: Optional[int] = None
         if self.course_metadata is not None and getattr(
@@ -315,63 +422,75 @@ class SmartSegmenter:
 
         raw_blocks: Optional[List[Tuple[Optional[str], str]]] = None
         page_count = 0
+        extraction_failed = False
 
-        # --- Tier 0: Metadata TOC page-number-driven segmentation ---
-        meta_blocks, page_count = self._extract_toc_metadata()
-        if meta_blocks:
-            logger.info(
-                f"Tier 0 (metadata TOC): {len(meta_blocks)} blocks — "
-                "using metadata TOC-driven segmentation."
-            )
-            raw_blocks = meta_blocks
-        else:
-            # --- Tier 1: bookmark outline TOC ---
-            toc_blocks, page_count = self._extract_toc()
-
-            if toc_blocks and _within_tolerance(len(toc_blocks)):
-                logger.info(
-                    f"TOC found with {len(toc_blocks)} entries — using TOC-based segmentation."
-                )
-                raw_blocks = toc_blocks
-            else:
-                if toc_blocks and toc_chapter_count is not None:
-                    logger.warning(
-                        f"Tier 1 (bookmark outline) produced {len(toc_blocks)} blocks, "
-                        f"metadata TOC has {toc_chapter_count} chapters "
-                        f"(tolerance ±2). Falling through to UNIT markers."
-                    )
+        # One pdfplumber handle for all tiers: each open re-parses the xref
+        # table, and a Tier 0 → Tier 3 fallthrough used to re-open (and
+        # re-scan font sizes for) the same document up to four times.
+        try:
+            with pdfplumber.open(self.pdf_path) as pdf:
+                page_count = len(pdf.pages)
 
-                # --- Tier 2: UNIT content markers ---
-                unit_blocks, page_count = self._extract_unit_markers()
-                if unit_blocks and _within_tolerance(len(unit_blocks)):
+                # --- Tier 0: Metadata TOC page-number-driven segmentation ---
+                meta_blocks = self._extract_toc_metadata(pdf)
+                if meta_blocks:
                     logger.info(
-                        f"UNIT markers found with {len(unit_blocks)} blocks — "
-                        f"using marker-based segmentation."
+                        f"Tier 0 (metadata TOC): {len(meta_blocks)} blocks — "
+                        "using metadata TOC-driven segmentation."
                     )
-                    raw_blocks = unit_blocks
+                    raw_blocks = meta_blocks
                 else:
-                    if unit_blocks and toc_chapter_count is not None:
-                        logger.warning(
-                            f"Tier 2 (UNIT markers) produced {len(unit_blocks)} blocks, "
-                            f"metadata TOC has {toc_chapter_count} chapters "
-                            f"(tolerance ±2). Falling through to font-heuristic."
-                        )
-                    else:
+                    # --- Tier 1: bookmark outline TOC ---
+                    toc_blocks = self._extract_toc(pdf)
+
+                    if toc_blocks and _within_tolerance(len(toc_blocks)):
                         logger.info(
-                            "No usable TOC or UNIT markers — falling back to font-heuristic."
+                            f"TOC found with {len(toc_blocks)} entries — using TOC-based segmentation."
                         )
+                        raw_blocks = toc_blocks
+                    else:
+                        if toc_blocks and toc_chapter_count is not None:
+                            logger.warning(
+                                f"Tier 1 (bookmark outline) produced {len(toc_blocks)} blocks, "
+                                f"metadata TOC has {toc_chapter_count} chapters "
+                                f"(tolerance ±2). Falling through to UNIT markers."
+                            )
 
-                    # --- Tier 3: font-heuristic (final tier; logs but does not fall through) ---
-                    raw_blocks, page_count = self._extract_blocks_with_headers()
-                    if (
-                        toc_chapter_count is not None
-                        and not _within_tolerance(len(raw_blocks))
-                    ):
-                        logger.warning(
-                            f"Tier 3 (font-heuristic) produced {len(raw_blocks)} blocks, "
-                            f"metadata TOC has {toc_chapter_count} chapters. "
-                            f"Final segmentation may be inaccurate — manual review recommended."
-                        )
+                        # --- Tier 2: UNIT content markers ---
+                        unit_blocks = self._extract_unit_markers(pdf)
+                        if unit_blocks and _within_tolerance(len(unit_blocks)):
+                            logger.info(
+                                f"UNIT markers found with {len(unit_blocks)} blocks — "
+                                f"using marker-based segmentation."
+                            )
+                            raw_blocks = unit_blocks
+                        else:
+                            if unit_blocks and toc_chapter_count is not None:
+                                logger.warning(
+                                    f"Tier 2 (UNIT markers) produced {len(unit_blocks)} blocks, "
+                                    f"metadata TOC has {toc_chapter_count} chapters "
+                                    f"(tolerance ±2). Falling through to font-heuristic."
+                                )
+                            else:
+                                logger.info(
+                                    "No usable TOC or UNIT markers — falling back to font-heuristic."
+                                )
+
+                            # --- Tier 3: font-heuristic (final tier; logs but does not fall through) ---
+                            raw_blocks = self._extract_blocks_with_headers(pdf)
+                            if (
+                                toc_chapter_count is not None
+                                and not _within_tolerance(len(raw_blocks))
+                            ):
+                                logger.warning(
+                                    f"Tier 3 (font-heuristic) produced {len(raw_blocks)} blocks, "
+                                    f"metadata TOC has {toc_chapter_count} chapters. "
+                                    f"Final segmentation may be inaccurate — manual review recommended."
+                                )
+        except Exception as e:
+            logger.error(f"Error reading PDF {self.pdf_path}: {e}")
+            raw_blocks = raw_blocks or []
+            extraction_failed = True
 
         logger.info(f"PDF has {page_count} pages — merging short blocks...")
 
@@ -407,6 +526,11 @@ class SmartSegmenter:
                 segment_id += 1
 
         logger.info(f"Generated {len(segments)} segments for {self.pdf_path.name}")
+        # Never persist a failed or empty extraction: a transient read error
+        # would otherwise replay as a silent zero-segment cache hit on every
+        # later run (mirrors the Module Gate cache refusing incomplete results).
+        if cache_path is not None and segments and not extraction_failed:
+            self._cache_store(cache_path, segments)
         return segments
 
     # ------------------------------------------------------------------
@@ -452,7 +576,7 @@ class SmartSegmenter:
     # Tier 0: Metadata-TOC-driven segmentation
     # ------------------------------------------------------------------
 
-    def _extract_toc_metadata(self) -> Tuple[List[Tuple[Optional[str], str]], int]:
+    def _extract_toc_metadata(self, pdf) -> List[Tuple[Optional[str], str]]:
         """Tier 0: Metadata-TOC-driven segmentation.
 
         Uses course_metadata.toc chapter titles to locate each chapter's
@@ -471,100 +595,92 @@ class SmartSegmenter:
           - Fewer than 2 chapter start pages can be located in the PDF
         """
         if not self.course_metadata or not getattr(self.course_metadata, "toc", None):
-            return [], 0
+            return []
 
         valid_entries = [e for e in self.course_metadata.toc if e.title]
         if len(valid_entries) < 2:
             logger.debug("Metadata TOC: fewer than 2 titled entries — skipping Tier 0.")
-            return [], 0
+            return []
 
         try:
-            with pdfplumber.open(self.pdf_path) as pdf:
-                page_count = len(pdf.pages)
+            page_count = len(pdf.pages)
 
-                # Extract first 400 chars of every page once (heading area)
-                page_heads: List[str] = []
-                for pg in pdf.pages:
-                    try:
-                        page_heads.append((pg.extract_text() or "")[:400].lower())
-                    except Exception:
-                        page_heads.append("")
+            # Extract first 400 chars of every page once (heading area)
+            page_heads: List[str] = []
+            for pg in pdf.pages:
+                try:
+                    page_heads.append((pg.extract_text() or "")[:400].lower())
+                except Exception:
+                    page_heads.append("")
+
+            # Identify TOC/Contents pages so we skip them during search
+            contents_pages = self._detect_contents_pages(page_heads, page_count)
+            search_from = (max(contents_pages) + 1) if contents_pages else 0
+            logger.debug(
+                f"Metadata TOC: contents pages = {sorted(contents_pages)}, "
+                f"start searching from page {search_from}."
+            )
 
-                # Identify TOC/Contents pages so we skip them during search
-                contents_pages = self._detect_contents_pages(page_heads, page_count)
-                search_from = (max(contents_pages) + 1) if contents_pages else 0
+            # Locate each chapter start page sequentially
+            chapter_pages: List[Tuple] = []
+            for entry in valid_entries:
+                found = self._find_chapter_start_page(
+                    page_heads, entry, search_from, page_count, contents_pages
+                )
+                if found is not None:
+                    chapter_pages.append((entry, found))
+                    search_from = found + 1
+
+            if len(chapter_pages) < 2:
                 logger.debug(
-                    f"Metadata TOC: contents pages = {sorted(contents_pages)}, "
-                    f"start searching from page {search_from}."
+                    "Metadata TOC: fewer than 2 chapter start pages found "
+                    "— skipping Tier 0."
                 )
+                return []
 
-                # Locate each chapter start page sequentially
-                chapter_pages: List[Tuple] = []
-                for entry in valid_entries:
-                    found = self._find_chapter_start_page(
-                        page_heads, entry, search_from, page_count, contents_pages
-                    )
-                    if found is not None:
-                        chapter_pages.append((entry, found))
-                        search_from = found + 1
-
-                if len(chapter_pages) < 2:
-                    logger.debug(
-                        "Metadata TOC: fewer than 2 chapter start pages found "
-                        "— skipping Tier 0."
-                    )
-                    return [], page_count
-
-                # Compute median font size for code-block detection
-                all_sizes: List[float] = []
-                for page in pdf.pages:
-                    words = page.extract_words(extra_attrs=["size"])
-                    all_sizes.extend([w["size"] for w in words if "size" in w])
-                all_sizes.sort()
-                median_size = all_sizes[len(all_sizes) // 2] if all_sizes else 10.0
-                header_threshold = median_size * 1.4
-
-                blocks: List[Tuple[Optional[str], str]] = []
-
-                # Frontmatter: everything before the first chapter
-                first_chapter_page = chapter_pages[0][1]
-                if first_chapter_page > 0:
-                    fm_text = self._extract_page_range_text(
-                        pdf, 0, first_chapter_page, header_threshold
-                    )
-                    if fm_text.strip():
-                        blocks.append(("Frontmatter", fm_text))
-
-                # One block per chapter
-                for i, (entry, start_page) in enumerate(chapter_pages):
-                    end_page = (
-                        chapter_pages[i + 1][1]
-                        if i + 1 < len(chapter_pages)
-                        else page_count
-                    )
-                    chapter_text = self._extract_page_range_text(
-                        pdf, start_page, end_page, header_threshold
-                    )
-                    if chapter_text.strip():
-                        heading = (
-                            f"Chapter {entry.chapter_number}: {entry.title}"
-                            if entry.chapter_number
-                            else entry.title
-                        )
-                        blocks.append((heading, chapter_text))
+            header_threshold = self._compute_header_threshold(pdf)
 
-                fm_count = 1 if blocks and blocks[0][0] == "Frontmatter" else 0
-                logger.info(
-                    f"Metadata TOC segmentation: {len(blocks)} blocks "
-                    f"({fm_count} frontmatter + {len(chapter_pages)} chapters)."
+            blocks: List[Tuple[Optional[str], str]] = []
+
+            # Frontmatter: everything before the first chapter
+            first_chapter_page = chapter_pages[0][1]
+            if first_chapter_page > 0:
+                fm_text = self._extract_page_range_text(
+                    pdf, 0, first_chapter_page, header_threshold
+                )
+                if fm_text.strip():
+                    blocks.append(("Frontmatter", fm_text))
+
+            # One block per chapter
+            for i, (entry, start_page) in enumerate(chapter_pages):
+                end_page = (
+                    chapter_pages[i + 1][1]
+                    if i + 1 < len(chapter_pages)
+                    else page_count
                 )
-                return blocks, page_count
+                chapter_text = self._extract_page_range_text(
+                    pdf, start_page, end_page, header_threshold
+                )
+                if chapter_text.strip():
+                    heading = (
+                        f"Chapter {entry.chapter_number}: {entry.title}"
+                        if entry.chapter_number
+                        else entry.title
+                    )
+                    blocks.append((heading, chapter_text))
+
+            fm_count = 1 if blocks and blocks[0][0] == "Frontmatter" else 0
+            logger.info(
+                f"Metadata TOC segmentation: {len(blocks)} blocks "
+                f"({fm_count} frontmatter + {len(chapter_pages)} chapters)."
+            )
+            return blocks
 
         except Exception as e:
             logger.error(
                 f"Metadata TOC extraction failed for {self.pdf_path.name}: {e}"
             )
-            return [], 0
+            return []
 
     def _detect_contents_pages(self, page_heads: List[str], page_count: int) -> set:
         """Return the set of physical page indices that are TOC/Contents pages.
@@ -666,7 +782,7 @@ class SmartSegmenter:
     # TOC-based segmentation (ADR-023 — primary strategy)
     # ------------------------------------------------------------------
 
-    def _extract_toc(self) -> Tuple[List[Tuple[Optional[str], str]], int]:
+    def _extract_toc(self, pdf) -> List[Tuple[Optional[str], str]]:
         """Use the PDF's bookmark outline to derive chapter-accurate segments.
 
         Each entry in the PDF outline provides a (title, page_number) pair.
@@ -680,171 +796,170 @@ class SmartSegmenter:
           - Blank line inserted between pages for readability.
 
         Returns:
-          - (blocks, page_count) if TOC has ≥2 usable entries.
-          - ([], page_count) if no usable TOC found (caller falls back to heuristic).
+          - blocks, if the TOC has ≥2 usable entries.
+          - [] if no usable TOC found (caller falls back to heuristic).
         """
         blocks: List[Tuple[Optional[str], str]] = []
-        page_count = 0
 
         try:
-            with pdfplumber.open(self.pdf_path) as pdf:
-                page_count = len(pdf.pages)
+            page_count = len(pdf.pages)
 
-                # --- Read the PDF outline ---
-                outline = []
-                try:
-                    raw_outline = pdf.doc.outline
-                    if raw_outline:
-                        outline = self._flatten_outline(raw_outline, pdf)
-                except Exception as e:
-                    logger.debug(f"Could not read PDF outline: {e}")
-
-                if len(outline) < 2:
-                    logger.debug(
-                        f"PDF outline has {len(outline)} entry/entries — too few for TOC segmentation."
-                    )
-                    return [], page_count
+            # --- Read the PDF outline ---
+            outline = []
+            try:
+                raw_outline = pdf.doc.outline
+                if raw_outline:
+                    outline = self._flatten_outline(raw_outline, pdf)
+            except Exception as e:
+                logger.debug(f"Could not read PDF outline: {e}")
 
-                logger.info(
-                    f"PDF outline has {len(outline)} entries. "
-                    f"Using TOC-based segmentation."
+            if len(outline) < 2:
+                logger.debug(
+                    f"PDF outline has {len(outline)} entry/entries — too few for TOC segmentation."
                 )
+                return []
 
-                # Determine per-page median font size for code-block detection
-                all_sizes = []
-                for page in pdf.pages:
-                    words = page.extract_words(extra_attrs=["size"])
-                    all_sizes.extend([w['size'] for w in words if 'size' in w])
-                all_sizes.sort()
-                median_size = all_sizes[len(all_sizes) // 2] if all_sizes else 10.0
-                header_threshold = median_size * 1.4
-
-                # Build page-range segments from TOC entries
-                # outline is a list of (title, 0-based-page-index)
-                for i, (title, start_page) in enumerate(outline):
-                    end_page = outline[i + 1][1] if i + 1 < len(outline) else page_count
-                    # Clamp to valid range
-                    start_page = max(0, min(start_page, page_count - 1))
-                    end_page   = max(start_page + 1, min(end_page, page_count))
-
-                    page_texts = []
-                    _ocr_warned = False
-                    for pg_idx in range(start_page, end_page):
-                        page = pdf.pages[pg_idx]
-                        W = float(page.width)
-                        H = float(page.height)
-                        body = page.within_bbox((0, H * 0.10, W, H * 0.92))
-
-                        raw_words = body.extract_words(extra_attrs=["size", "fontname"])
-                        if not raw_words:
-                            # OCR fallback for scanned pages
-                            if _check_ocr_available():
-                                if not _ocr_warned:
-                                    logger.info(
-                                        f"[TOC-OCR] Scanned pages in '{self.pdf_path.name}' — "
-                                        "using Tesseract fallback."
-                                    )
-                                    _ocr_warned = True
-                                ocr_text = _ocr_page(self.pdf_path, pg_idx)
-                                if ocr_text:
-                                    clean_lines = [
-                                        ln for ln in ocr_text.splitlines()
-                                        if ln.strip() and not re.fullmatch(r'\d+', ln.strip())
-                                    ]
-                                    page_texts.extend(clean_lines)
-                            continue
+            logger.info(
+                f"PDF outline has {len(outline)} entries. "
+                f"Using TOC-based segmentation."
+            )
 
-                        # Table detection (same as font-heuristic path)
-                        table_bboxes = []
-                        table_annotations = []
-                        try:
-                            tables = body.find_tables()
-                            for table in tables:
-                                bbox = table.bbox
-                                table_bboxes.append(bbox)
-                                try:
-                                    extracted = table.extract()
-                                    if extracted:
-                                        table_text = "\n".join(
-                                            " | ".join(
-                                                str(cell).strip() if cell is not None else ''
-                                                for cell in row
-                                            )
-                                            for row in extracted
-                                            if any(cell is not None for cell in row)
-                                        )
-                                        annotation = (
-                                            f"[TABLE:\n{table_text[:4000]}\n]"
-                                            if table_text.strip()
-                                            else "[TABLE]"
+            # Shared per-document median font size (code-block detection)
+            header_threshold = self._compute_header_threshold(pdf)
+
+            # Build page-range segments from TOC entries
+            # outline is a list of (title, 0-based-page-index)
+            for i, (title, start_page) in enumerate(outline):
+                end_page = outline[i + 1][1] if i + 1 < len(outline) else page_count
+                # Clamp to valid range
+                start_page = max(0, min(start_page, page_count - 1))
+                end_page   = max(start_page + 1, min(end_page, page_count))
+
+                page_texts = []
+                _ocr_warned = False
+                for pg_idx in range(start_page, end_page):
+                    page = pdf.pages[pg_idx]
+                    W = float(page.width)
+                    H = float(page.height)
+                    body = page.within_bbox((0, H * 0.10, W, H * 0.92))
+
+                    raw_words = body.extract_words(extra_attrs=["size", "fontname"])
+                    if not raw_words:
+                        # OCR fallback for scanned pages
+                        if _check_ocr_available():
+                            if not _ocr_warned:
+                                logger.info(
+                                    f"[TOC-OCR] Scanned pages in '{self.pdf_path.name}' — "
+                                    "using Tesseract fallback."
+                                )
+                                _ocr_warned = True
+                            ocr_text = _ocr_page(self.pdf_path, pg_idx)
+                            if ocr_text:
+                                clean_lines = [
+                                    ln for ln in ocr_text.splitlines()
+                                    if ln.strip() and not re.fullmatch(r'\d+', ln.strip())
+                                ]
+                                page_texts.extend(clean_lines)
+                        continue
+
+                    # Table detection (same as font-heuristic path)
+                    table_bboxes = []
+                    table_annotations = []
+                    try:
+                        # Ruling-line probe: the default pdfplumber strategy only finds
+                        # tables framed by lines/rects/curves, and find_tables is its
+                        # most expensive operation — skip pages that draw none.
+                        tables = (
+                            body.find_tables()
+                            if (body.lines or body.rects or body.curves)
+                            else []
+                        )
+                        for table in tables:
+                            bbox = table.bbox
+                            table_bboxes.append(bbox)
+                            try:
+                                extracted = table.extract()
+                                if extracted:
+                                    table_text = "\n".join(
+                                        " | ".join(
+                                            str(cell).strip() if cell is not None else ''
+                                            for cell in row
                                         )
-                                    else:
-                                        annotation = "[TABLE]"
-                                except Exception:
+                                        for row in extracted
+                                        if any(cell is not None for cell in row)
+                                    )
+                                    annotation = (
+                                        f"[TABLE:\n{table_text[:4000]}\n]"
+                                        if table_text.strip()
+                                        else "[TABLE]"
+                                    )
+                                else:
                                     annotation = "[TABLE]"
-                                table_annotations.append((bbox[1], annotation))
-                        except Exception:
-                            pass
+                            except Exception:
+                                annotation = "[TABLE]"
+                            table_annotations.append((bbox[1], annotation))
+                    except Exception:
+                        pass
 
-                        # Filter out words inside table bboxes
-                        filtered_words = [
-                            w for w in raw_words
-                            if not any(
-                                w['x0'] >= tx0 and w['x1'] <= tx1
-                                and w['top'] >= ttop and w['bottom'] <= tbot
-                                for (tx0, ttop, tx1, tbot) in table_bboxes
-                            )
-                        ]
+                    # Filter out words inside table bboxes
+                    filtered_words = [
+                        w for w in raw_words
+                        if not any(
+                            w['x0'] >= tx0 and w['x1'] <= tx1
+                            and w['top'] >= ttop and w['bottom'] <= tbot
+                            for (tx0, ttop, tx1, tbot) in table_bboxes
+                        )
+                    ]
 
-                        lines = self._words_to_lines(filtered_words, header_threshold)
+                    lines = self._words_to_lines(filtered_words, header_threshold)
 
-                        # Inject table annotations at correct Y positions and build page text
-                        in_code_block = False
-                        line_iter = iter(lines)
-                        page_line_texts = []
-
-                        for ann_y, ann_text in sorted(table_annotations, key=lambda x: x[0]):
-                            page_line_texts.append(ann_text)
-
-                        # Simple linear pass: just reconstruct text with code markers
-                        for line in lines:
-                            text = line['text'].strip()
-                            if not text or re.fullmatch(r'\d+', text):
-                                continue
-                            # Figure caption injection (Issue 6)
-                            fig_match = re.match(
-                                r'(Fig\.?\s*\d+\.\d+)\s+(.+)', text, re.IGNORECASE
-                            )
-                            if fig_match and not line['is_code'] and line['max_size'] < header_threshold:
-                                page_line_texts.append(
-                                    f"[FIGURE {fig_match.group(1)}: {fig_match.group(2).strip()}]"
-                                )
-                                continue
-                            # Code block markers
-                            if line['is_code'] and not in_code_block:
-                                page_line_texts.append("[CODE]")
-                                in_code_block = True
-                            elif not line['is_code'] and in_code_block:
-                                page_line_texts.append("[/CODE]")
-                                in_code_block = False
-                            page_line_texts.append(text)
+                    # Inject table annotations at correct Y positions and build page text
+                    in_code_block = False
+                    line_iter = iter(lines)
+                    page_line_texts = []
 
-                        if in_code_block:
+                    for ann_y, ann_text in sorted(table_annotations, key=lambda x: x[0]):
+                        page_line_texts.append(ann_text)
+
+                    # Simple linear pass: just reconstruct text with code markers
+                    for line in lines:
+                        text = line['text'].strip()
+                        if not text or re.fullmatch(r'\d+', text):
+                            continue
+                        # Figure caption injection (Issue 6)
+                        fig_match = re.match(
+                            r'(Fig\.?\s*\d+\.\d+)\s+(.+)', text, re.IGNORECASE
+                        )
+                        if fig_match and not line['is_code'] and line['max_size'] < header_threshold:
+                            page_line_texts.append(
+                                f"[FIGURE {fig_match.group(1)}: {fig_match.group(2).strip()}]"
+                            )
+                            continue
+                        # Code block markers
+                        if line['is_code'] and not in_code_block:
+                            page_line_texts.append("[CODE]")
+                            in_code_block = True
+                        elif not line['is_code'] and in_code_block:
                             page_line_texts.append("[/CODE]")
                             in_code_block = False
+                        page_line_texts.append(text)
+
+                    if in_code_block:
+                        page_line_texts.append("[/CODE]")
+                        in_code_block = False
 
-                        if page_line_texts:
-                            page_texts.append("\n".join(page_line_texts))
+                    if page_line_texts:
+                        page_texts.append("\n".join(page_line_texts))
 
-                    combined_text = "\n\n".join(page_texts).strip()
-                    if combined_text:
-                        blocks.append((title.strip() if title else None, combined_text))
+                combined_text = "\n\n".join(page_texts).strip()
+                if combined_text:
+                    blocks.append((title.strip() if title else None, combined_text))
 
         except Exception as e:
             logger.error(f"Error reading PDF for TOC extraction: {e}")
-            return [], page_count
+            return []
 
-        return blocks, page_count
+        return blocks
 
     def _flatten_outline(self, outline, pdf) -> List[Tuple[Optional[str], int]]:
         """Recursively flatten the PDF bookmark tree into [(title, 0-based-page-num)].
@@ -899,7 +1014,7 @@ class SmartSegmenter:
     # Tier 2: UNIT content marker scan
     # ------------------------------------------------------------------
 
-    def _extract_unit_markers(self) -> Tuple[List[Tuple[Optional[str], str]], int]:
+    def _extract_unit_markers(self, pdf) -> List[Tuple[Optional[str], str]]:
         """Scan ALL PDF pages for explicit UNIT markers to derive segment boundaries.
 
         Searches each page's first ~200 characters for patterns like:
@@ -912,8 +1027,8 @@ class SmartSegmenter:
         markers, making it robust to PDFs where each unit starts mid-document.
 
         Returns:
-            (blocks, page_count) if ≥2 UNIT markers found with monotonic pages.
-            ([], page_count) otherwise — caller falls through to font-heuristic.
+            blocks, if ≥2 UNIT markers are found with monotonic pages.
+            [] otherwise — caller falls through to font-heuristic.
         """
         _UNIT_MARKER_RE = re.compile(r'UNIT\s*[-\u2013]?\s*([IVX]+|\d+)', re.IGNORECASE)
         _ROMAN_MAP = {
@@ -922,94 +1037,87 @@ class SmartSegmenter:
         }
 
         try:
-            with pdfplumber.open(self.pdf_path) as pdf:
-                page_count = len(pdf.pages)
+            page_count = len(pdf.pages)
+
+            # Pass 1: Find pages with UNIT markers near the top
+            unit_pages = []
+            for pg_idx in range(page_count):
+                text = (pdf.pages[pg_idx].extract_text() or '')[:300]
+                m = _UNIT_MARKER_RE.search(text[:200])
+                if not m:
+                    continue
 
-                # Pass 1: Find pages with UNIT markers near the top
-                unit_pages = []
-                for pg_idx in range(page_count):
-                    text = (pdf.pages[pg_idx].extract_text() or '')[:300]
-                    m = _UNIT_MARKER_RE.search(text[:200])
-                    if not m:
-                        continue
+                unit_id = m.group(1).strip().upper()
+                if unit_id in _ROMAN_MAP:
+                    unit_num = _ROMAN_MAP[unit_id]
+                elif unit_id.isdigit():
+                    unit_num = int(unit_id)
+                else:
+                    continue
 
-                    unit_id = m.group(1).strip().upper()
-                    if unit_id in _ROMAN_MAP:
-                        unit_num = _ROMAN_MAP[unit_id]
-                    elif unit_id.isdigit():
-                        unit_num = int(unit_id)
-                    else:
-                        continue
+                # Title hint from text immediately after the marker
+                after = text[m.end():].strip()
+                title_line = after.split('\n')[0].strip()[:80]
+                title_line = re.sub(r'^[-\u2013:\s]+', '', title_line).strip()
+                unit_pages.append((unit_num, pg_idx, title_line))
+
+            # Deduplicate: keep first occurrence of each unit number
+            seen: set = set()
+            deduped = []
+            for unit_num, pg_idx, title in unit_pages:
+                if unit_num not in seen:
+                    seen.add(unit_num)
+                    deduped.append((unit_num, pg_idx, title))
+
+            if len(deduped) < 2:
+                logger.debug(f"Found {len(deduped)} UNIT marker(s) — too few.")
+                return []
+
+            # Validate monotonicity
+            sorted_entries = sorted(deduped, key=lambda x: x[0])
+            pages = [p for _, p, _ in sorted_entries]
+            if not all(pages[i] < pages[i + 1] for i in range(len(pages) - 1)):
+                logger.warning("UNIT markers non-monotonic — skipping.")
+                return []
 
-                    # Title hint from text immediately after the marker
-                    after = text[m.end():].strip()
-                    title_line = after.split('\n')[0].strip()[:80]
-                    title_line = re.sub(r'^[-\u2013:\s]+', '', title_line).strip()
-                    unit_pages.append((unit_num, pg_idx, title_line))
-
-                # Deduplicate: keep first occurrence of each unit number
-                seen: set = set()
-                deduped = []
-                for unit_num, pg_idx, title in unit_pages:
-                    if unit_num not in seen:
-                        seen.add(unit_num)
-                        deduped.append((unit_num, pg_idx, title))
-
-                if len(deduped) < 2:
-                    logger.debug(f"Found {len(deduped)} UNIT marker(s) — too few.")
-                    return [], page_count
-
-                # Validate monotonicity
-                sorted_entries = sorted(deduped, key=lambda x: x[0])
-                pages = [p for _, p, _ in sorted_entries]
-                if not all(pages[i] < pages[i + 1] for i in range(len(pages) - 1)):
-                    logger.warning("UNIT markers non-monotonic — skipping.")
-                    return [], page_count
-
-                logger.info(
-                    f"Found {len(sorted_entries)} UNIT markers: "
-                    + ", ".join(f"Unit {u} @ p.{p+1}" for u, p, _ in sorted_entries)
-                )
+            logger.info(
+                f"Found {len(sorted_entries)} UNIT markers: "
+                + ", ".join(f"Unit {u} @ p.{p+1}" for u, p, _ in sorted_entries)
+            )
 
-                # Compute median font size for code-block detection
-                all_sizes: List[float] = []
-                for page in pdf.pages:
-                    words = page.extract_words(extra_attrs=["size"])
-                    all_sizes.extend([w['size'] for w in words if 'size' in w])
-                all_sizes.sort()
-                median_size = all_sizes[len(all_sizes) // 2] if all_sizes else 10.0
-                header_threshold = median_size * 1.4
-
-                blocks: List[Tuple[Optional[str], str]] = []
-
-                # Frontmatter (pages before first unit)
-                first_unit_page = sorted_entries[0][1]
-                if first_unit_page > 0:
-                    fm_text = self._extract_page_range_text(
-                        pdf, 0, first_unit_page, header_threshold
-                    )
-                    if fm_text.strip():
-                        blocks.append(("Frontmatter", fm_text))
-
-                # Each unit
-                for i, (unit_num, start_page, title) in enumerate(sorted_entries):
-                    end_page = (
-                        sorted_entries[i + 1][1]
-                        if i + 1 < len(sorted_entries)
-                        else page_count
-                    )
-                    unit_text = self._extract_page_range_text(
-                        pdf, start_page, end_page, header_threshold
-                    )
-                    if unit_text.strip():
-                        heading = f"Unit {unit_num}: {title}" if title else f"Unit {unit_num}"
-                        blocks.append((heading, unit_text))
+            # Shared per-document median font size (code-block detection)
+            header_threshold = self._compute_header_threshold(pdf)
+
+            blocks: List[Tuple[Optional[str], str]] = []
+
+            # Frontmatter (pages before first unit)
+            first_unit_page = sorted_entries[0][1]
+            if first_unit_page > 0:
+                fm_text = self._extract_page_range_text(
+                    pdf, 0, first_unit_page, header_threshold
+                )
+                if fm_text.strip():
+                    blocks.append(("Frontmatter", fm_text))
+
+            # Each unit
+            for i, (unit_num, start_page, title) in enumerate(sorted_entries):
+                end_page = (
+                    sorted_entries[i + 1][1]
+                    if i + 1 < len(sorted_entries)
+                    else page_count
+                )
+                unit_text = self._extract_page_range_text(
+                    pdf, start_page, end_page, header_threshold
+                )
+                if unit_text.strip():
+                    heading = f"Unit {unit_num}: {title}" if title else f"Unit {unit_num}"
+                    blocks.append((heading, unit_text))
 
-                return blocks, page_count
+            return blocks
 
         except Exception as e:
             logger.error(f"Error in UNIT marker extraction: {e}")
-            return [], page_count
+            return []
 
     # ------------------------------------------------------------------
     # Shared: Extract and annotate text from a page range
@@ -1053,7 +1161,14 @@ class SmartSegmenter:
             table_bboxes = []
             table_annotations = []
             try:
-                tables = body.find_tables()
+                # Ruling-line probe: the default pdfplumber strategy only finds
+                # tables framed by lines/rects/curves, and find_tables is its
+                # most expensive operation — skip pages that draw none.
+                tables = (
+                    body.find_tables()
+                    if (body.lines or body.rects or body.curves)
+                    else []
+                )
                 for table in tables:
                     bbox = table.bbox
                     table_bboxes.append(bbox)
@@ -1337,7 +1452,7 @@ class SmartSegmenter:
             result.append({'text': text, 'max_size': max_size, 'is_code': is_code, 'is_bold': is_bold})
         return result
 
-    def _extract_blocks_with_headers(self) -> Tuple[List[Tuple[Optional[str], str]], int]:
+    def _extract_blocks_with_headers(self, pdf) -> List[Tuple[Optional[str], str]]:
         """Extract text from PDF and identify major section headers by significant font-size jump.
 
         Crops each page to body region (top 10%, bottom 8%) to strip running headers/footers.
@@ -1350,207 +1465,201 @@ class SmartSegmenter:
         Only triggers a new block when the line's max font size is >= 1.4x the body median
         AND the line is short enough to be a title (< 80 chars).
 
-        Returns (blocks, page_count).
+        Returns the list of (heading, text) blocks.
         """
         blocks = []
         current_heading: Optional[str] = None
         current_text_lines: List[str] = []
-        page_count = 0
 
         try:
-            with pdfplumber.open(self.pdf_path) as pdf:
-                page_count = len(pdf.pages)
-
-                # 1. Determine median font size across ALL pages for a stable baseline
-                all_sizes = []
-                for page in pdf.pages:
-                    words = page.extract_words(extra_attrs=["size"])
-                    all_sizes.extend([w['size'] for w in words if 'size' in w])
-
-                if not all_sizes:
-                    logger.warning(f"Could not detect text natively in {self.pdf_path.name}. Will use OCR if available.")
-                    # Don't return early — let the per-page loop try OCR
-                    median_size = 10.0  # sensible default when no native text exists
-                    header_threshold = median_size * 1.4
-                else:
-                    all_sizes.sort()
-                    median_size = all_sizes[len(all_sizes) // 2]
-                    header_threshold = median_size * 1.4
-                    logger.info(f"Body median font size: {median_size:.1f}pt — chapter header threshold: {header_threshold:.1f}pt")
-
-                # 2. Extract and group lines per page
-                _ocr_warned = False
-                for page in pdf.pages:
-                    W = float(page.width)
-                    H = float(page.height)
-
-                    # Crop to body region — strips running headers (top 10%) and footers (bottom 8%)
-                    body = page.within_bbox((0, H * 0.10, W, H * 0.92))
-
-                    # --- OCR FALLBACK: if page has no native text, try tesseract ---
-                    raw_words_check = body.extract_words(extra_attrs=["size", "fontname"])
-                    if not raw_words_check:
-                        if _check_ocr_available():
-                            if not _ocr_warned:
-                                logger.info(f"[OCR] Scanned pages detected in {self.pdf_path.name} — using Tesseract OCR fallback.")
-                                _ocr_warned = True
-                            ocr_text = _ocr_page(self.pdf_path, page.page_number - 1)
-                            if ocr_text:
-                                # Strip common OCR noise: lines that are just digits (page numbers)
-                                clean_lines = [
-                                    ln for ln in ocr_text.splitlines()
-                                    if ln.strip() and not re.fullmatch(r'\d+', ln.strip())
-                                ]
-                                current_text_lines.extend(clean_lines)
-                        else:
-                            logger.debug(f"[OCR] Page {page.page_number} has no native text and tesseract is not available — skipping.")
-                        continue
+            # 1. Shared per-document median font size for a stable baseline
+            header_threshold = self._compute_header_threshold(pdf)
+            if not self._has_native_text:
+                # Don't return early — let the per-page loop try OCR
+                logger.warning(f"Could not detect text natively in {self.pdf_path.name}. Will use OCR if available.")
+            else:
+                logger.info(f"Chapter header threshold: {header_threshold:.1f}pt (1.4x body median)")
+
+            # 2. Extract and group lines per page
+            _ocr_warned = False
+            for page in pdf.pages:
+                W = float(page.width)
+                H = float(page.height)
+
+                # Crop to body region — strips running headers (top 10%) and footers (bottom 8%)
+                body = page.within_bbox((0, H * 0.10, W, H * 0.92))
+
+                # --- OCR FALLBACK: if page has no native text, try tesseract ---
+                raw_words_check = body.extract_words(extra_attrs=["size", "fontname"])
+                if not raw_words_check:
+                    if _check_ocr_available():
+                        if not _ocr_warned:
+                            logger.info(f"[OCR] Scanned pages detected in {self.pdf_path.name} — using Tesseract OCR fallback.")
+                            _ocr_warned = True
+                        ocr_text = _ocr_page(self.pdf_path, page.page_number - 1)
+                        if ocr_text:
+                            # Strip common OCR noise: lines that are just digits (page numbers)
+                            clean_lines = [
+                                ln for ln in ocr_text.splitlines()
+                                if ln.strip() and not re.fullmatch(r'\d+', ln.strip())
+                            ]
+                            current_text_lines.extend(clean_lines)
+                    else:
+                        logger.debug(f"[OCR] Page {page.page_number} has no native text and tesseract is not available — skipping.")
+                    continue
 
-                    # Detect tables in the body region; collect bounding boxes
-                    table_bboxes = []
-                    table_annotations = []  # list of (y_pos, annotation_text)
-                    try:
-                        tables = body.find_tables()
-                        for table in tables:
-                            bbox = table.bbox  # (x0, top, x1, bottom)
-                            table_bboxes.append(bbox)
-                            # Build annotation from all rows of extracted data
-                            try:
-                                extracted = table.extract()
-                                if extracted:
-                                    table_text = "\n".join(
-                                        " | ".join(str(cell).strip() if cell is not None else '' for cell in row)
-                                        for row in extracted if any(cell is not None for cell in row)
-                                    )
-                                    if table_text.strip():
-                                        annotation = f"[TABLE:\n{table_text}\n]"
-                                        # Truncate if it exceeds reasonable context window size
-                                        if len(annotation) > 4000:
-                                            annotation = annotation[:4000] + "\n...]"
-                                    else:
-                                        annotation = "[TABLE]"
+                # Detect tables in the body region; collect bounding boxes
+                table_bboxes = []
+                table_annotations = []  # list of (y_pos, annotation_text)
+                try:
+                    # Ruling-line probe: the default pdfplumber strategy only finds
+                    # tables framed by lines/rects/curves, and find_tables is its
+                    # most expensive operation — skip pages that draw none.
+                    tables = (
+                        body.find_tables()
+                        if (body.lines or body.rects or body.curves)
+                        else []
+                    )
+                    for table in tables:
+                        bbox = table.bbox  # (x0, top, x1, bottom)
+                        table_bboxes.append(bbox)
+                        # Build annotation from all rows of extracted data
+                        try:
+                            extracted = table.extract()
+                            if extracted:
+                                table_text = "\n".join(
+                                    " | ".join(str(cell).strip() if cell is not None else '' for cell in row)
+                                    for row in extracted if any(cell is not None for cell in row)
+                                )
+                                if table_text.strip():
+                                    annotation = f"[TABLE:\n{table_text}\n]"
+                                    # Truncate if it exceeds reasonable context window size
+                                    if len(annotation) > 4000:
+                                        annotation = annotation[:4000] + "\n...]"
                                 else:
                                     annotation = "[TABLE]"
-                            except Exception:
+                            else:
                                 annotation = "[TABLE]"
-                            table_annotations.append((bbox[1], annotation))  # top Y of table
-                    except Exception:
-                        pass
-
-                    # Extract words from body, skipping those inside table bounding boxes
-                    raw_words = body.extract_words(extra_attrs=["size", "fontname"])
-                    filtered_words = []
-                    for w in raw_words:
-                        in_table = False
-                        for (tx0, ttop, tx1, tbot) in table_bboxes:
-                            if w['x0'] >= tx0 and w['x1'] <= tx1 and w['top'] >= ttop and w['bottom'] <= tbot:
-                                in_table = True
-                                break
-                        if not in_table:
-                            filtered_words.append(w)
-
-                    # Reconstruct lines from word objects
-                    lines = self._words_to_lines(filtered_words, header_threshold)
-
-                    # Build a merged sequence: lines + table annotations, sorted by Y
-                    line_entries = []  # (y, type, data)
-                    if filtered_words:
-                        line_groups: dict = {}
-                        for w in filtered_words:
-                            key = round(w['doctop'] / 2) * 2
-                            line_groups.setdefault(key, []).append(w)
-                        for y in sorted(line_groups):
-                            line_entries.append((y, 'line', None))
-
-                    for (ty, annotation) in table_annotations:
-                        page_offset = page.doctop if hasattr(page, 'doctop') else 0
-                        line_entries.append((ty + page_offset, 'table', annotation))
-
-                    line_entries.sort(key=lambda e: e[0])
-
-                    # Process in Y order
-                    line_iter = iter(lines)
-                    in_code_block = False
+                        except Exception:
+                            annotation = "[TABLE]"
+                        table_annotations.append((bbox[1], annotation))  # top Y of table
+                except Exception:
+                    pass
+
+                # Extract words from body, skipping those inside table bounding boxes
+                raw_words = body.extract_words(extra_attrs=["size", "fontname"])
+                filtered_words = []
+                for w in raw_words:
+                    in_table = False
+                    for (tx0, ttop, tx1, tbot) in table_bboxes:
+                        if w['x0'] >= tx0 and w['x1'] <= tx1 and w['top'] >= ttop and w['bottom'] <= tbot:
+                            in_table = True
+                            break
+                    if not in_table:
+                        filtered_words.append(w)
+
+                # Reconstruct lines from word objects
+                lines = self._words_to_lines(filtered_words, header_threshold)
+
+                # Build a merged sequence: lines + table annotations, sorted by Y
+                line_entries = []  # (y, type, data)
+                if filtered_words:
+                    line_groups: dict = {}
+                    for w in filtered_words:
+                        key = round(w['doctop'] / 2) * 2
+                        line_groups.setdefault(key, []).append(w)
+                    for y in sorted(line_groups):
+                        line_entries.append((y, 'line', None))
+
+                for (ty, annotation) in table_annotations:
+                    page_offset = page.doctop if hasattr(page, 'doctop') else 0
+                    line_entries.append((ty + page_offset, 'table', annotation))
+
+                line_entries.sort(key=lambda e: e[0])
+
+                # Process in Y order
+                line_iter = iter(lines)
+                in_code_block = False
+
+                for (y, entry_type, data) in line_entries:
+                    if entry_type == 'table':
+                        if in_code_block:
+                            current_text_lines.append("[/CODE]")
+                            in_code_block = False
+                        current_text_lines.append(data)
+                        continue
 
-                    for (y, entry_type, data) in line_entries:
-                        if entry_type == 'table':
-                            if in_code_block:
-                                current_text_lines.append("[/CODE]")
-                                in_code_block = False
-                            current_text_lines.append(data)
-                            continue
+                    # entry_type == 'line'
+                    try:
+                        line = next(line_iter)
+                    except StopIteration:
+                        break
 
-                        # entry_type == 'line'
-                        try:
-                            line = next(line_iter)
-                        except StopIteration:
-                            break
+                    text = line['text'].strip()
+                    if not text:
+                        continue
 
-                        text = line['text'].strip()
-                        if not text:
-                            continue
+                    max_size = line['max_size']
+                    is_code = line['is_code']
 
-                        max_size = line['max_size']
-                        is_code = line['is_code']
+                    # Skip pure page numbers
+                    if re.fullmatch(r'\d+', text):
+                        continue
 
-                        # Skip pure page numbers
-                        if re.fullmatch(r'\d+', text):
-                            continue
+                    # Critic Issue 6: figure caption injection
+                    # Detect lines that ARE figure captions (e.g. "Fig. 1.1 The Python interpreter")
+                    fig_caption_match = re.match(
+                        r'(Fig\.?\s*\d+\.\d+)\s+(.+)', text, re.IGNORECASE
+                    )
+                    if fig_caption_match and not is_code and max_size < header_threshold:
+                        fig_id = fig_caption_match.group(1)
+                        caption = fig_caption_match.group(2).strip()
+                        current_text_lines.append(f"[FIGURE {fig_id}: {caption}]")
+                        continue
 
-                        # Critic Issue 6: figure caption injection
-                        # Detect lines that ARE figure captions (e.g. "Fig. 1.1 The Python interpreter")
-                        fig_caption_match = re.match(
-                            r'(Fig\.?\s*\d+\.\d+)\s+(.+)', text, re.IGNORECASE
-                        )
-                        if fig_caption_match and not is_code and max_size < header_threshold:
-                            fig_id = fig_caption_match.group(1)
-                            caption = fig_caption_match.group(2).strip()
-                            current_text_lines.append(f"[FIGURE {fig_id}: {caption}]")
-                            continue
+                    # Handle CODE block transitions
+                    if is_code and not in_code_block:
+                        current_text_lines.append("[CODE]")
+                        in_code_block = True
+                    elif not is_code and in_code_block:
+                        current_text_lines.append("[/CODE]")
+                        in_code_block = False
 
-                        # Handle CODE block transitions
-                        if is_code and not in_code_block:
-                            current_text_lines.append("[CODE]")
-                            in_code_block = True
-                        elif not is_code and in_code_block:
+                    is_bold = line.get('is_bold', False)
+
+                    # ADR-029 (critic.v3 Issue 1): Bold-frequency filter.
+                    # Bold text qualifies as a header ONLY if:
+                    #  - bold_as_header is enabled
+                    #  - the text is not a high-frequency label
+                    #  - the text does not end with ':' (label pattern)
+                    #  - the text is not a common code label word
+                    bold_ok = False
+                    if self.bold_as_header and is_bold:
+                        text_lower = text.lower().rstrip('.,:;')
+                        if (text_lower not in _BOLD_LABEL_EXCLUSIONS
+                                and not text.endswith(':')
+                                and text_lower not in _KNOWN_RUNNING_HEADERS):
+                            bold_ok = True
+
+                    # Chapter-level header: significant size jump OR qualified bold, AND short enough to be a title
+                    is_header = (len(text) < 80 and (max_size >= header_threshold or bold_ok))
+
+                    if is_header:
+                        if in_code_block:
                             current_text_lines.append("[/CODE]")
                             in_code_block = False
+                        # Save previous block before starting a new section
+                        if current_text_lines:
+                            blocks.append((current_heading, "\n".join(current_text_lines)))
+                            current_text_lines = []
+                        current_heading = text
+                    else:
+                        current_text_lines.append(text)
 
-                        is_bold = line.get('is_bold', False)
-
-                        # ADR-029 (critic.v3 Issue 1): Bold-frequency filter.
-                        # Bold text qualifies as a header ONLY if:
-                        #  - bold_as_header is enabled
-                        #  - the text is not a high-frequency label
-                        #  - the text does not end with ':' (label pattern)
-                        #  - the text is not a common code label word
-                        bold_ok = False
-                        if self.bold_as_header and is_bold:
-                            text_lower = text.lower().rstrip('.,:;')
-                            if (text_lower not in _BOLD_LABEL_EXCLUSIONS
-                                    and not text.endswith(':')
-                                    and text_lower not in _KNOWN_RUNNING_HEADERS):
-                                bold_ok = True
-
-                        # Chapter-level header: significant size jump OR qualified bold, AND short enough to be a title
-                        is_header = (len(text) < 80 and (max_size >= header_threshold or bold_ok))
-
-                        if is_header:
-                            if in_code_block:
-                                current_text_lines.append("[/CODE]")
-                                in_code_block = False
-                            # Save previous block before starting a new section
-                            if current_text_lines:
-                                blocks.append((current_heading, "\n".join(current_text_lines)))
-                                current_text_lines = []
-                            current_heading = text
-                        else:
-                            current_text_lines.append(text)
-
-                    # Close any open code block at end of page
-                    if in_code_block:
-                        current_text_lines.append("[/CODE]")
-                        in_code_block = False
+                # Close any open code block at end of page
+                if in_code_block:
+                    current_text_lines.append("[/CODE]")
+                    in_code_block = False
 
             # Append the final block
             if current_text_lines:
@@ -1559,7 +1668,7 @@ class SmartSegmenter:
         except Exception as e:
             logger.error(f"Error reading PDF {self.pdf_path}: {e}")
 
-        return blocks, page_count
+        return blocks
 
     def _merge_short_blocks(
         self,
@@ -92,6 +92,73 @@ def test_explicit_metadata_source_overrides_sibling(tmp_path):
     assert metadata.author == "Override Author"
 
 
+# ============================================================================
+# HTML metadata source (<title> / <meta> / OpenGraph / Dublin Core)
+# ============================================================================
+
+def test_html_metadata_happy_path_and_precedence(tmp_path):
+    """og:title beats <title>; plain description beats og:description;
+    the first occurrence of a repeated meta tag wins."""
+    pdf_path = tmp_path / "course.pdf"
+    pdf_path.touch()
+
+    html_path = tmp_path / "page.html"
+    html_path.write_text(
+        "<html><head>"
+        "<title>Fallback Title</title>"
+        '<meta property="og:title" content="OpenGraph Title">'
+        '<meta name="author" content="First Author">'
+        '<meta name="author" content="Second Author">'
+        '<meta name="description" content="A plain description.">'
+        '<meta property="og:description" content="An OG description.">'
+        '<meta name="DC.publisher" content="Green Tea Press">'
+        "</head><body><p>Body text.</p></body></html>"
+    )
+
+    metadata = MetadataIngestor(pdf_path, metadata_source=html_path).ingest()
+
+    assert metadata.title == "OpenGraph Title"
+    assert metadata.author == "First Author"
+    assert metadata.description == "A plain description."
+    assert metadata.publisher == "Green Tea Press"
+    assert metadata.source == "page.html"
+
+
+def test_html_metadata_no_usable_tags_warns(tmp_path, caplog):
+    """HTML with no <title> or recognised <meta> tags warns and returns
+    defaults with only `source` populated."""
+    pdf_path = tmp_path / "course.pdf"
+    pdf_path.touch()
+
+    html_path = tmp_path / "bare.html"
+    html_path.write_text("<html><body><p>Just body text, no head.</p></body></html>")
+
+    with caplog.at_level("WARNING", logger="src.metadata"):
+        metadata = MetadataIngestor(pdf_path, metadata_source=html_path).ingest()
+
+    assert metadata.title == ""
+    assert metadata.author == ""
+    assert metadata.source == "bare.html"
+    assert any("No usable" in rec.message for rec in caplog.records)
+
+
+def test_html_metadata_unreadable_falls_back_to_pdf_source(tmp_path):
+    """If the HTML source cannot be read, _parse_html falls back to an empty
+    CourseMetadata carrying the course PDF's filename as source."""
+    pdf_path = tmp_path / "course.pdf"
+    pdf_path.touch()
+
+    # A directory with an .html suffix exists but cannot be read as text.
+    html_path = tmp_path / "broken.html"
+    html_path.mkdir()
+
+    metadata = MetadataIngestor(pdf_path, metadata_source=html_path).ingest()
+
+    assert isinstance(metadata, CourseMetadata)
+    assert metadata.title == ""
+    assert metadata.source == "course.pdf"
+
+
 # ============================================================================
 # Source field is always populated
 # ============================================================================